@@ -0,0 +1,549 @@
+"""
+Entity API endpoints for the Knowledge Storage MCP.
+
+This module provides endpoints for creating, retrieving, and querying
+knowledge entities in the Neo4j database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import functools
+import json
+import logging
+import os
+import uuid
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+
+from cachetools import TTLCache
+
+# Local imports
+from knowledge_storage_mcp.utils.logging import setup_logging
+
+# The MCP SDK and the Neo4j driver are heavy transitive imports; they
+# are only needed once endpoints are actually registered, so importing
+# this module stays cheap for tools that just want the package.
+if TYPE_CHECKING:
+    from modelcontextprotocol import MCPServer
+    from knowledge_storage_mcp.db.connection import Neo4jConnection
+
+# Setup logging
+logger = setup_logging(__name__)
+
+# Pagination defaults
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Sizing for the property-lookup cache
+ENTITY_CACHE_SIZE = 10_000
+ENTITY_CACHE_TTL = 60
+
+@functools.lru_cache(maxsize=1024)
+def _where_for(keys: tuple) -> str:
+    """
+    Build the WHERE clause for a sorted property-key tuple.
+
+    Shared by the read endpoints and memoized per shape, so the warm
+    path does no per-call clause construction.
+
+    Args:
+        keys (tuple): Sorted property keys
+
+    Returns:
+        str: WHERE clause with a parameterized label filter
+    """
+    return " AND ".join(
+        ("($etype IS NULL OR $etype IN labels(e))",
+         *(f"e.{key} = $prop_{key}" for key in keys))
+    )
+
+@functools.lru_cache(maxsize=1024)
+def _list_query_for(keys: tuple) -> str:
+    """
+    Build the list_entities query for a sorted property-key tuple.
+
+    The text depends only on the key shape (labels, values, and
+    pagination are parameters), so one bounded memo entry serves every
+    entity type and page with that shape.
+
+    Args:
+        keys (tuple): Sorted property keys
+
+    Returns:
+        str: Count-and-page query text
+    """
+    return (
+        f"MATCH (e:Entity) WHERE {_where_for(keys)}"
+        " WITH collect(e) AS all_entities"
+        " RETURN size(all_entities) AS count,"
+        " [x IN all_entities[$skip..$skip + $limit] |"
+        " {props: properties(x), labels: labels(x)}] AS entities"
+    )
+
+@functools.lru_cache(maxsize=1024)
+def _get_query_for(entity_type: Optional[str], keys: tuple,
+                   index_keys: Optional[tuple]) -> str:
+    """
+    Build the property-lookup query for a shape.
+
+    Args:
+        entity_type (Optional[str]): Schema-validated entity type, when
+            a composite index covers the shape
+        keys (tuple): Sorted property keys
+        index_keys (Optional[tuple]): Covering index keys, if any
+
+    Returns:
+        str: Single-entity lookup query text
+    """
+    if index_keys:
+        return (
+            f"MATCH (e:{entity_type})"
+            f" USING INDEX e:{entity_type}({', '.join(index_keys)})"
+            " WHERE "
+            + " AND ".join(f"e.{key} = $prop_{key}" for key in keys)
+            + " RETURN properties(e) AS e LIMIT 1"
+        )
+    return (f"MATCH (e:Entity) WHERE {_where_for(keys)}"
+            " RETURN properties(e) AS e LIMIT 1")
+
+def _bulk_uuids(n: int) -> List[str]:
+    """
+    Generate n random entity identifiers from one urandom read.
+
+    Args:
+        n (int): Number of identifiers to generate
+
+    Returns:
+        List[str]: Hex-formatted version-4 UUIDs
+    """
+    buf = os.urandom(16 * n)
+    return [uuid.UUID(bytes=buf[i * 16:(i + 1) * 16], version=4).hex
+            for i in range(n)]
+
+def _hashable(value: Any) -> Any:
+    """
+    Return a hashable cache-key component for a property value.
+
+    Args:
+        value (Any): Property value
+
+    Returns:
+        Any: The value itself, or a canonical JSON string for
+        unhashable values such as lists and dicts
+    """
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return json.dumps(value, sort_keys=True)
+
+def register_entity_endpoints(server: MCPServer, db_connection: Neo4jConnection) -> None:
+    """
+    Register entity API endpoints with the MCP server.
+
+    Args:
+        server (MCPServer): The MCP server instance
+        db_connection (Neo4jConnection): Database connection instance
+    """
+    logger.info("Registering entity API endpoints")
+
+    # Deferred imports; see the module-level TYPE_CHECKING note.
+    from modelcontextprotocol import MCPFunctionParameter
+    from knowledge_storage_mcp.api.queries import invalidate_query_cache
+    from knowledge_storage_mcp.db.schema import SchemaManager
+
+    schema_manager = SchemaManager(db_connection)
+
+    # Composite lookup indexes turn hot property lookups into index
+    # seeks instead of label scans; created in the background so
+    # registration does not block startup on the DDL round-trips.
+    threading.Thread(
+        target=schema_manager.create_lookup_indexes,
+        name="lookup-index-init",
+        daemon=True,
+    ).start()
+
+    # Property lookups are idempotent point reads hammered by upstream
+    # resolvers, so repeated identical requests are served from this
+    # in-process cache instead of going back over Bolt. Entries expire
+    # after a short TTL and are invalidated on entity writes.
+    entity_cache: TTLCache = TTLCache(maxsize=ENTITY_CACHE_SIZE, ttl=ENTITY_CACHE_TTL)
+
+    # The schema is immutable for the life of the server, so the
+    # property whitelist per entity type is computed once; membership
+    # checks on the hot path are then a single frozenset hash lookup.
+    @functools.lru_cache(maxsize=128)
+    def _allowed_keys(entity_type: str) -> frozenset:
+        return frozenset(schema_manager.get_allowed_properties(entity_type))
+
+    async def _bulk_create(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Create a batch of entities, one UNWIND statement per entity type.
+
+        Args:
+            entries (List[Dict[str, Any]]): List of {entity_type, properties}
+                objects to create
+
+        Returns:
+            Dict[str, Any]: Result with the created entity identifiers
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        missing_id = []
+        for position, entry in enumerate(entries):
+            entity_type = entry.get("entity_type")
+            # The label is interpolated into the query text, so reject
+            # anything that is not a schema-defined entity type.
+            if not schema_manager.is_valid_entity_type(entity_type):
+                return {
+                    "success": False,
+                    "message": f"Unknown entity type '{entity_type}'"
+                }
+            properties = dict(entry.get("properties") or {})
+            # Same schema gate the relationship path applies: required,
+            # unknown, and mistyped properties are rejected before any
+            # row reaches the database.
+            validation = schema_manager.validate_entity(entity_type, properties)
+            if not validation["valid"]:
+                return {
+                    "success": False,
+                    "message": (f"Invalid entity at position {position}: "
+                                f"{'; '.join(validation['errors'])}")
+                }
+            if "id" not in properties:
+                missing_id.append(properties)
+            groups.setdefault(entity_type, []).append(properties)
+
+        # One getrandom syscall covers every generated identifier in
+        # the batch instead of one per entity.
+        if missing_id:
+            for properties, new_id in zip(missing_id, _bulk_uuids(len(missing_id))):
+                properties["id"] = new_id
+
+        entity_ids = []
+        for entity_type, rows in groups.items():
+            # One UNWIND per type amortizes the Bolt round-trip and the
+            # transaction commit across the whole group instead of
+            # paying both per entity.
+            create_query = f"""
+                UNWIND $rows AS row
+                CREATE (e:Entity:{entity_type})
+                SET e = row
+                RETURN e.id AS id
+            """
+            result = await asyncio.to_thread(
+                db_connection.execute_query, create_query, {"rows": rows}
+            )
+            entity_ids.extend(record["id"] for record in result)
+
+        # Drop cached lookups that could now be stale for the written
+        # types (untyped lookups can match entities of any type).
+        written = set(groups)
+        for cache_key in [k for k in entity_cache if k[0] is None or k[0] in written]:
+            del entity_cache[cache_key]
+        invalidate_query_cache()
+
+        return {
+            "success": True,
+            "entity_ids": entity_ids,
+            "count": len(entity_ids)
+        }
+
+    @server.register_function(
+        name="create_entities_bulk",
+        description="Create multiple entities in the knowledge graph in one batch",
+        parameters=[
+            MCPFunctionParameter(
+                name="entities",
+                description="List of {entity_type, properties} objects to create",
+                required=True
+            )
+        ]
+    )
+    async def create_entities_bulk(entities: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Create multiple entities in the knowledge graph in one batch.
+
+        Args:
+            entities (List[Dict[str, Any]]): List of {entity_type, properties}
+                objects to create
+
+        Returns:
+            Dict[str, Any]: Created entity identifiers
+        """
+        logger.info(f"Creating {len(entities)} entities in bulk")
+
+        try:
+            result = await _bulk_create(entities)
+            if result["success"]:
+                result["message"] = "Entities created successfully"
+            return result
+        except Exception as e:
+            logger.error(f"Failed to create entities in bulk: {str(e)}")
+            return {
+                "success": False,
+                "message": f"Failed to create entities in bulk: {str(e)}"
+            }
+
+    @server.register_function(
+        name="create_entity",
+        description="Create an entity in the knowledge graph",
+        parameters=[
+            MCPFunctionParameter(
+                name="entity_type",
+                description="Type of entity (e.g., 'Concept', 'Symbol', 'Document')",
+                required=True
+            ),
+            MCPFunctionParameter(
+                name="properties",
+                description="Entity properties following the schema for the entity type",
+                required=True
+            )
+        ]
+    )
+    async def create_entity(entity_type: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create an entity in the knowledge graph.
+
+        Args:
+            entity_type (str): Type of entity
+            properties (Dict[str, Any]): Entity properties
+
+        Returns:
+            Dict[str, Any]: Created entity information
+        """
+        logger.info(f"Creating entity of type '{entity_type}'")
+
+        try:
+            if "id" not in properties:
+                # hex skips the dash formatting of str(uuid.uuid4())
+                properties["id"] = uuid.uuid4().hex
+
+            # Single creates share the bulk path with a one-element batch.
+            result = await _bulk_create(
+                [{"entity_type": entity_type, "properties": properties}]
+            )
+
+            if not result["success"]:
+                return result
+
+            return {
+                "success": True,
+                "entity_id": properties["id"],
+                "entity_type": entity_type,
+                "properties": properties,
+                "message": "Entity created successfully"
+            }
+        except Exception as e:
+            logger.error(f"Failed to create entity: {str(e)}")
+            return {
+                "success": False,
+                "message": f"Failed to create entity: {str(e)}"
+            }
+
+    @server.register_function(
+        name="list_entities",
+        description="List entities in the knowledge graph with filtering and pagination",
+        parameters=[
+            MCPFunctionParameter(
+                name="entity_type",
+                description="Type of entity to filter by (e.g., 'Concept', 'Symbol')",
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="properties",
+                description="Property values to filter by",
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="page",
+                description="Page number (1-based)",
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="page_size",
+                description=f"Number of entities per page (max {MAX_PAGE_SIZE})",
+                required=False
+            )
+        ]
+    )
+    async def list_entities(entity_type: Optional[str] = None,
+                            properties: Optional[Dict[str, Any]] = None,
+                            page: int = 1,
+                            page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        List entities in the knowledge graph with filtering and pagination.
+
+        Args:
+            entity_type (Optional[str]): Type of entity to filter by
+            properties (Optional[Dict[str, Any]]): Property values to filter by
+            page (int): Page number (1-based)
+            page_size (int): Number of entities per page
+
+        Returns:
+            Dict[str, Any]: Matching entities with pagination metadata
+        """
+        logger.info(f"Listing entities of type '{entity_type}'")
+
+        try:
+            page = max(1, page)
+            page_size = min(max(1, page_size), MAX_PAGE_SIZE)
+            skip = (page - 1) * page_size
+
+            if entity_type and not schema_manager.is_valid_entity_type(entity_type):
+                return {
+                    "success": False,
+                    "message": f"Unknown entity type '{entity_type}'"
+                }
+
+            keys = tuple(sorted(properties)) if properties else ()
+            allowed = _allowed_keys(entity_type) if entity_type else None
+            for key in keys:
+                # Property keys are interpolated into the query text, so
+                # only plain identifiers are accepted.
+                if not key.isidentifier():
+                    return {
+                        "success": False,
+                        "message": f"Invalid property key '{key}'"
+                    }
+                if allowed is not None and key not in allowed:
+                    return {
+                        "success": False,
+                        "message": f"Unknown property '{key}' for entity type '{entity_type}'"
+                    }
+
+            # One bounded memo entry per property-key shape; a single
+            # round-trip returns both the total count and the page.
+            query = _list_query_for(keys)
+
+            params = {"etype": entity_type, "skip": skip, "limit": page_size}
+            for key in keys:
+                params[f"prop_{key}"] = properties[key]
+
+            # Consume the single aggregated record straight off the
+            # result stream instead of having the driver buffer an
+            # intermediate record list first.
+            def _fetch_record():
+                stream = db_connection.stream_query(query, params)
+                try:
+                    return next(stream, None)
+                finally:
+                    stream.close()
+
+            record = await asyncio.to_thread(_fetch_record)
+
+            total_count = record["count"] if record else 0
+            # Only the page's property maps (plus labels) cross the
+            # wire; the driver no longer deserializes full Node objects
+            # with per-record metadata.
+            entities = [dict(item["props"], _labels=item["labels"])
+                        for item in (record["entities"] if record else [])]
+
+            return {
+                "success": True,
+                "entities": entities,
+                "count": total_count,
+                "page": page,
+                "page_size": page_size
+            }
+        except Exception as e:
+            logger.error(f"Failed to list entities: {str(e)}")
+            return {
+                "success": False,
+                "message": f"Failed to list entities: {str(e)}"
+            }
+
+    @server.register_function(
+        name="get_entity_by_properties",
+        description="Find an entity in the knowledge graph by its property values",
+        parameters=[
+            MCPFunctionParameter(
+                name="entity_type",
+                description="Type of entity to filter by (e.g., 'Concept', 'Symbol')",
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="properties",
+                description="Property values to match",
+                required=True
+            )
+        ]
+    )
+    async def get_entity_by_properties(properties: Dict[str, Any],
+                                       entity_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Find an entity in the knowledge graph by its property values.
+
+        Args:
+            properties (Dict[str, Any]): Property values to match
+            entity_type (Optional[str]): Type of entity to filter by
+
+        Returns:
+            Dict[str, Any]: Matching entity information
+        """
+        logger.info(f"Getting entity of type '{entity_type}' by properties")
+
+        try:
+            if entity_type and not schema_manager.is_valid_entity_type(entity_type):
+                return {
+                    "success": False,
+                    "message": f"Unknown entity type '{entity_type}'"
+                }
+
+            cache_key = (
+                entity_type,
+                frozenset((k, _hashable(v)) for k, v in properties.items()),
+            )
+            cached = entity_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            keys = tuple(sorted(properties))
+            allowed = _allowed_keys(entity_type) if entity_type else None
+            for key in keys:
+                if not key.isidentifier():
+                    return {
+                        "success": False,
+                        "message": f"Invalid property key '{key}'"
+                    }
+                if allowed is not None and key not in allowed:
+                    return {
+                        "success": False,
+                        "message": f"Unknown property '{key}' for entity type '{entity_type}'"
+                    }
+
+            # When a composite lookup index covers this shape, match on
+            # the concrete label and hint the index; entity_type is
+            # schema-validated above, so interpolating it is safe.
+            # Otherwise fall back to the parameterized label filter.
+            index_keys = (schema_manager.get_lookup_index(entity_type, keys)
+                          if entity_type else None)
+            query = _get_query_for(entity_type if index_keys else None,
+                                   keys, index_keys)
+
+            params = {"etype": entity_type}
+            for key in keys:
+                params[f"prop_{key}"] = properties[key]
+
+            result = await asyncio.to_thread(db_connection.execute_query, query, params)
+
+            if not result:
+                return {
+                    "success": False,
+                    "message": "Entity not found"
+                }
+
+            response = {
+                "success": True,
+                "entity": result[0]["e"]
+            }
+            entity_cache[cache_key] = response
+            return response
+        except Exception as e:
+            logger.error(f"Failed to get entity by properties: {str(e)}")
+            return {
+                "success": False,
+                "message": f"Failed to get entity by properties: {str(e)}"
+            }
+
+    logger.info("Entity API endpoints registered")
@@ -0,0 +1,1142 @@
+"""
+Specialized query API endpoints for the Knowledge Storage MCP.
+
+This module provides endpoints for the academic query patterns of the
+knowledge graph: symbol-concept resolution, tiered knowledge retrieval,
+entity search, path finding, and cross-domain mappings.
+"""
+
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+from cachetools import TTLCache
+
+# MCP SDK imports
+from modelcontextprotocol import MCPServer, MCPFunctionParameter
+
+from neo4j.exceptions import Neo4jError
+
+# Local imports
+from knowledge_storage_mcp.db.connection import Neo4jConnection
+from knowledge_storage_mcp.utils.logging import setup_logging
+
+# Setup logging
+logger = setup_logging(__name__)
+
+# Default result limit for entity search
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# Default maximum traversal depth for path finding
+DEFAULT_MAX_DEPTH = 3
+
+# Knowledge tier suffixes on tiered properties
+TIER_SUFFIXES = ("l1", "l2", "l3")
+
+# Bounded cache for the read endpoints: the graph changes slowly and
+# MCP clients re-ask the same lookups within a session, so hot keys
+# skip the Neo4j round-trip entirely. Writes invalidate in bulk by
+# bumping the version that is folded into every key.
+QUERY_CACHE_SIZE = 4096
+QUERY_CACHE_TTL = 60
+
+# Paths deeper than this are too expensive to be worth caching space
+MAX_CACHED_PATH_DEPTH = 5
+
+# Cap on co-shortest paths returned by find_paths; on dense graphs the
+# number of equal-length paths explodes combinatorially
+MAX_RETURNED_PATHS = 50
+
+# Hard ceiling on path-finding depth; beyond this the search radius
+# covers essentially the whole graph
+MAX_PATH_DEPTH = 10
+
+_query_cache: TTLCache = TTLCache(maxsize=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL)
+_cache_version = 0
+
+# Set once the server reports apoc.map.fromPairs unknown; the tier
+# endpoint then projects in Python instead of failing every call
+_apoc_map_missing = False
+
+def invalidate_query_cache() -> None:
+    """Invalidate all cached query responses after a graph write."""
+    global _cache_version
+    _cache_version += 1
+
+def _cache_key(endpoint: str, **params) -> tuple:
+    """
+    Build a cache key for an endpoint invocation.
+
+    Args:
+        endpoint (str): Endpoint name
+        **params: Normalized endpoint arguments
+
+    Returns:
+        tuple: Cache key incorporating the current cache version
+    """
+    return (_cache_version, endpoint, frozenset(params.items()))
+
+@lru_cache(maxsize=1024)
+def _find_paths_cypher(selector: str, rel_filter: str,
+                       max_depth: int, limit: int) -> str:
+    """
+    Build (once per bounded shape) the find_paths query text.
+
+    The structural arguments cannot be query parameters; memoizing the
+    finished string per canonicalized shape skips the reformatting on
+    repeats, and the lru bound keeps novel filter combinations from
+    accumulating.
+
+    Args:
+        selector (str): 'ANY SHORTEST' or 'ALL SHORTEST'
+        rel_filter (str): Validated relationship filter fragment
+        max_depth (int): Clamped traversal depth
+        limit (int): Clamped path limit
+
+    Returns:
+        str: find_paths Cypher text
+    """
+    return f"""
+        MATCH (source:Entity {{id: $source_id}}), (target:Entity {{id: $target_id}})
+        MATCH path = {selector} (source)-[{rel_filter}]-{{1,{max_depth}}}(target)
+        RETURN length(path) AS length,
+               [n IN nodes(path) | n{{.*, _labels: labels(n)}}] AS nodes,
+               [r IN relationships(path) | {{type: type(r), properties: properties(r)}}] AS relationships
+        LIMIT {limit}
+    """
+
+@lru_cache(maxsize=1024)
+def _find_paths_multi_cypher(rel_filter: str, max_depth: int) -> str:
+    """
+    Build (once per bounded shape) the find_paths_multi query text.
+
+    Args:
+        rel_filter (str): Validated relationship filter fragment
+        max_depth (int): Clamped traversal depth
+
+    Returns:
+        str: find_paths_multi Cypher text
+    """
+    return f"""
+        UNWIND $pairs AS p
+        MATCH (source:Entity {{id: p.source_id}}), (target:Entity {{id: p.target_id}})
+        OPTIONAL MATCH path = shortestPath((source)-[{rel_filter}*..{max_depth}]-(target))
+        RETURN p.source_id AS source_id, p.target_id AS target_id,
+               length(path) AS length,
+               [n IN nodes(path) | n{{.*, _labels: labels(n)}}] AS nodes,
+               [r IN relationships(path) | {{type: type(r), properties: properties(r)}}] AS relationships
+    """
+
+def _build_rel_filter(relationship_types: Optional[List[str]]) -> tuple:
+    """
+    Build the relationship-type filter fragment for a path pattern.
+
+    Relationship types cannot be query parameters inside a pattern, so
+    they are interpolated — which makes validation mandatory: anything
+    that is not a plain identifier is rejected rather than spliced into
+    Cypher text. Canonicalization (deduplicated, sorted) keeps the
+    generated text stable across equivalent calls.
+
+    Args:
+        relationship_types (Optional[List[str]]): Relationship types to
+            traverse (None or empty means all)
+
+    Returns:
+        tuple: (filter fragment, list of rejected type names)
+    """
+    if not relationship_types:
+        return "", []
+    invalid = [t for t in relationship_types
+               if not isinstance(t, str) or not t.isidentifier()]
+    if invalid:
+        return "", invalid
+    return ":" + "|".join(sorted(set(relationship_types))), []
+
+def register_query_endpoints(server: MCPServer, db_connection: Neo4jConnection) -> None:
+    """
+    Register specialized query API endpoints with the MCP server.
+
+    Args:
+        server (MCPServer): The MCP server instance
+        db_connection (Neo4jConnection): Database connection instance
+    """
+    logger.info("Registering query API endpoints")
+
+    # Pre-bind the hot logging methods once; the closures below then
+    # call a local instead of doing an attribute lookup on the logger
+    # for every request.
+    _log_debug = logger.debug
+    _log_error = logger.error
+
+    def _warm_page_cache() -> None:
+        """
+        Create the full-text index backing search_entities, then pull
+        the node, relationship, and index stores into the Neo4j page
+        cache so the first queries after a deploy don't pay the
+        cold-disk penalty. Prefers apoc.warmup.run; without APOC,
+        count scans touch the same store files.
+        """
+        started = time.monotonic()
+        try:
+            # Lucene serves text matches in milliseconds where a
+            # CONTAINS filter walks every node under the label.
+            db_connection.execute_query(
+                "CREATE FULLTEXT INDEX entity_fts IF NOT EXISTS "
+                "FOR (n:Concept|Symbol) "
+                "ON EACH [n.name, n.description, n.notation, n.domain]"
+            )
+        except Exception as e:
+            logger.warning(f"Full-text index creation failed: {str(e)}")
+        try:
+            try:
+                db_connection.execute_query("CALL apoc.warmup.run(true, true, true)")
+            except Exception:
+                db_connection.execute_query("MATCH (e:Entity) RETURN count(e)")
+                db_connection.execute_query("MATCH ()-[r]->() RETURN count(r)")
+            logger.info(f"Page cache warmup finished in {time.monotonic() - started:.2f}s")
+        except Exception as e:
+            logger.warning(f"Page cache warmup failed: {str(e)}")
+
+    # Run in the background so server startup is not blocked on the
+    # Bolt handshake, index DDL, or the warmup scan.
+    threading.Thread(target=_warm_page_cache, name="page-cache-warmup", daemon=True).start()
+
+    @server.register_function(
+        name="find_symbols_for_concept",
+        description="Find the symbols that represent a concept",
+        parameters=[
+            MCPFunctionParameter(
+                name="concept_id",
+                description="Concept identifier",
+                required=True
+            )
+        ]
+    )
+    async def find_symbols_for_concept(concept_id: str) -> Dict[str, Any]:
+        """
+        Find the symbols that represent a concept.
+
+        Args:
+            concept_id (str): Concept identifier
+
+        Returns:
+            Dict[str, Any]: Symbols representing the concept
+        """
+        _log_debug("Finding symbols for concept '%s'", concept_id)
+
+        try:
+            cache_key = _cache_key("find_symbols_for_concept", concept_id=concept_id)
+            cached = _query_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # Anchor lookup and neighbor collection share one query, so
+            # existence and results come back in a single round-trip;
+            # a null-free empty collect distinguishes "no symbols" from
+            # "concept not found" (empty result).
+            query = """
+                MATCH (c:Concept {id: $concept_id})
+                OPTIONAL MATCH (s:Symbol)-[r:REPRESENTS]->(c)
+                RETURN properties(c) AS concept,
+                       collect({symbol: properties(s), relationship: properties(r)}) AS symbols
+            """
+
+            result = await db_connection.execute_query_async(query, {"concept_id": concept_id})
+
+            if not result:
+                return {
+                    "success": False,
+                    "message": f"Concept with ID '{concept_id}' not found"
+                }
+
+            symbols = [s for s in result[0]["symbols"] if s["symbol"] is not None]
+
+            response = {
+                "success": True,
+                "concept": result[0]["concept"],
+                "symbols": symbols,
+                "count": len(symbols)
+            }
+            _query_cache[cache_key] = response
+            return response
+        except Neo4jError as e:
+            # Driver errors carry a short status code and message;
+            # str(e) would materialize the full server stack trace.
+            _log_error("Failed to find symbols for concept: code=%s msg=%s", e.code, e.message)
+            return {
+                "success": False,
+                "error_code": e.code,
+                "message": f"Failed to find symbols for concept: {e.message}"
+            }
+        except Exception as e:
+            _log_error("Failed to find symbols for concept: %s", e)
+            return {
+                "success": False,
+                "message": f"Failed to find symbols for concept: {str(e)}"
+            }
+
+    @server.register_function(
+        name="find_concepts_for_symbol",
+        description="Find the concepts represented by a symbol",
+        parameters=[
+            MCPFunctionParameter(
+                name="symbol_id",
+                description="Symbol identifier",
+                required=True
+            )
+        ]
+    )
+    async def find_concepts_for_symbol(symbol_id: str) -> Dict[str, Any]:
+        """
+        Find the concepts represented by a symbol.
+
+        Args:
+            symbol_id (str): Symbol identifier
+
+        Returns:
+            Dict[str, Any]: Concepts represented by the symbol
+        """
+        _log_debug("Finding concepts for symbol '%s'", symbol_id)
+
+        try:
+            cache_key = _cache_key("find_concepts_for_symbol", symbol_id=symbol_id)
+            cached = _query_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # Single round-trip; see find_symbols_for_concept.
+            query = """
+                MATCH (s:Symbol {id: $symbol_id})
+                OPTIONAL MATCH (s)-[r:REPRESENTS]->(c:Concept)
+                RETURN properties(s) AS symbol,
+                       collect({concept: properties(c), relationship: properties(r)}) AS concepts
+            """
+
+            result = await db_connection.execute_query_async(query, {"symbol_id": symbol_id})
+
+            if not result:
+                return {
+                    "success": False,
+                    "message": f"Symbol with ID '{symbol_id}' not found"
+                }
+
+            concepts = [c for c in result[0]["concepts"] if c["concept"] is not None]
+
+            response = {
+                "success": True,
+                "symbol": result[0]["symbol"],
+                "concepts": concepts,
+                "count": len(concepts)
+            }
+            _query_cache[cache_key] = response
+            return response
+        except Neo4jError as e:
+            # Driver errors carry a short status code and message;
+            # str(e) would materialize the full server stack trace.
+            _log_error("Failed to find concepts for symbol: code=%s msg=%s", e.code, e.message)
+            return {
+                "success": False,
+                "error_code": e.code,
+                "message": f"Failed to find concepts for symbol: {e.message}"
+            }
+        except Exception as e:
+            _log_error("Failed to find concepts for symbol: %s", e)
+            return {
+                "success": False,
+                "message": f"Failed to find concepts for symbol: {str(e)}"
+            }
+
+    @server.register_function(
+        name="find_symbols_for_concepts",
+        description="Find the symbols that represent each of a batch of concepts",
+        parameters=[
+            MCPFunctionParameter(
+                name="concept_ids",
+                description="Concept identifiers",
+                required=True
+            )
+        ]
+    )
+    async def find_symbols_for_concepts(concept_ids: List[str]) -> Dict[str, Any]:
+        """
+        Find the symbols that represent each of a batch of concepts.
+
+        Args:
+            concept_ids (List[str]): Concept identifiers
+
+        Returns:
+            Dict[str, Any]: Symbols per concept, keyed by concept id
+        """
+        _log_debug("Finding symbols for %d concepts", len(concept_ids))
+
+        try:
+            cache_key = _cache_key("find_symbols_for_concepts",
+                                   concept_ids=tuple(concept_ids))
+            cached = _query_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # UNWIND resolves the whole batch in one Bolt round-trip
+            # and one plan-cache entry; the :Concept(id) constraint
+            # serves each anchor lookup.
+            query = """
+                UNWIND $concept_ids AS cid
+                MATCH (c:Concept {id: cid})
+                OPTIONAL MATCH (s:Symbol)-[r:REPRESENTS]->(c)
+                RETURN cid,
+                       properties(c) AS concept,
+                       collect({symbol: properties(s), relationship: properties(r)}) AS symbols
+            """
+
+            result = await db_connection.execute_query_async(
+                query, {"concept_ids": concept_ids}
+            )
+
+            results = {}
+            for record in result:
+                symbols = [s for s in record["symbols"] if s["symbol"] is not None]
+                results[record["cid"]] = {
+                    "concept": record["concept"],
+                    "symbols": symbols,
+                    "count": len(symbols)
+                }
+            missing = [cid for cid in concept_ids if cid not in results]
+
+            response = {
+                "success": True,
+                "results": results,
+                "missing": missing,
+                "count": len(results)
+            }
+            _query_cache[cache_key] = response
+            return response
+        except Neo4jError as e:
+            # Driver errors carry a short status code and message;
+            # str(e) would materialize the full server stack trace.
+            _log_error("Failed to find symbols for concepts: code=%s msg=%s", e.code, e.message)
+            return {
+                "success": False,
+                "error_code": e.code,
+                "message": f"Failed to find symbols for concepts: {e.message}"
+            }
+        except Exception as e:
+            _log_error("Failed to find symbols for concepts: %s", e)
+            return {
+                "success": False,
+                "message": f"Failed to find symbols for concepts: {str(e)}"
+            }
+
+    @server.register_function(
+        name="find_concepts_for_symbols",
+        description="Find the concepts represented by each of a batch of symbols",
+        parameters=[
+            MCPFunctionParameter(
+                name="symbol_ids",
+                description="Symbol identifiers",
+                required=True
+            )
+        ]
+    )
+    async def find_concepts_for_symbols(symbol_ids: List[str]) -> Dict[str, Any]:
+        """
+        Find the concepts represented by each of a batch of symbols.
+
+        Args:
+            symbol_ids (List[str]): Symbol identifiers
+
+        Returns:
+            Dict[str, Any]: Concepts per symbol, keyed by symbol id
+        """
+        _log_debug("Finding concepts for %d symbols", len(symbol_ids))
+
+        try:
+            cache_key = _cache_key("find_concepts_for_symbols",
+                                   symbol_ids=tuple(symbol_ids))
+            cached = _query_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # Single round-trip batch form of find_concepts_for_symbol.
+            query = """
+                UNWIND $symbol_ids AS sid
+                MATCH (s:Symbol {id: sid})
+                OPTIONAL MATCH (s)-[r:REPRESENTS]->(c:Concept)
+                RETURN sid,
+                       properties(s) AS symbol,
+                       collect({concept: properties(c), relationship: properties(r)}) AS concepts
+            """
+
+            result = await db_connection.execute_query_async(
+                query, {"symbol_ids": symbol_ids}
+            )
+
+            results = {}
+            for record in result:
+                concepts = [c for c in record["concepts"] if c["concept"] is not None]
+                results[record["sid"]] = {
+                    "symbol": record["symbol"],
+                    "concepts": concepts,
+                    "count": len(concepts)
+                }
+            missing = [sid for sid in symbol_ids if sid not in results]
+
+            response = {
+                "success": True,
+                "results": results,
+                "missing": missing,
+                "count": len(results)
+            }
+            _query_cache[cache_key] = response
+            return response
+        except Neo4jError as e:
+            # Driver errors carry a short status code and message;
+            # str(e) would materialize the full server stack trace.
+            _log_error("Failed to find concepts for symbols: code=%s msg=%s", e.code, e.message)
+            return {
+                "success": False,
+                "error_code": e.code,
+                "message": f"Failed to find concepts for symbols: {e.message}"
+            }
+        except Exception as e:
+            _log_error("Failed to find concepts for symbols: %s", e)
+            return {
+                "success": False,
+                "message": f"Failed to find concepts for symbols: {str(e)}"
+            }
+
+    @server.register_function(
+        name="get_entity_with_tier",
+        description="Get an entity with its knowledge at a specific tier (L1, L2, L3)",
+        parameters=[
+            MCPFunctionParameter(
+                name="entity_id",
+                description="Entity identifier",
+                required=True
+            ),
+            MCPFunctionParameter(
+                name="tier",
+                description="Knowledge tier ('L1', 'L2', or 'L3')",
+                required=True
+            )
+        ]
+    )
+    async def get_entity_with_tier(entity_id: str, tier: str) -> Dict[str, Any]:
+        """
+        Get an entity with its knowledge at a specific tier.
+
+        Args:
+            entity_id (str): Entity identifier
+            tier (str): Knowledge tier ('L1', 'L2', or 'L3')
+
+        Returns:
+            Dict[str, Any]: Entity with tier-appropriate properties
+        """
+        _log_debug("Getting entity '%s' at tier '%s'", entity_id, tier)
+
+        try:
+            if tier.lower() not in TIER_SUFFIXES:
+                return {
+                    "success": False,
+                    "message": f"Invalid tier '{tier}' (expected 'L1', 'L2', or 'L3')"
+                }
+
+            cache_key = _cache_key("get_entity_with_tier",
+                                   entity_id=entity_id, tier=tier.lower())
+            cached = _query_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # Labels are merged into the single fetch so no second
+            # query is needed for the entity type. The tier view is
+            # computed server-side with apoc.map.fromPairs: only the
+            # base and requested-tier properties cross the wire, and
+            # the O(P^2) Python suffix scan over wide nodes goes away.
+            # Without APOC the full property map is fetched and split
+            # here instead — same degradation style as the warmup.
+            global _apoc_map_missing
+            result = None
+            if not _apoc_map_missing:
+                query = """
+                    MATCH (e:Entity {id: $entity_id})
+                    WITH e, labels(e) AS lbls, '_' + $tier_suffix AS suffix
+                    RETURN lbls,
+                           apoc.map.fromPairs(
+                               [k IN keys(e) WHERE k ENDS WITH suffix |
+                                [substring(k, 0, size(k) - size(suffix)), e[k]]]
+                           ) AS tier_props,
+                           apoc.map.fromPairs(
+                               [k IN keys(e)
+                                WHERE NOT (k ENDS WITH '_l1' OR k ENDS WITH '_l2' OR k ENDS WITH '_l3') |
+                                [k, e[k]]]
+                           ) AS base_props
+                """
+                try:
+                    result = await db_connection.execute_query_async(query, {
+                        "entity_id": entity_id,
+                        "tier_suffix": tier.lower()
+                    })
+                except Neo4jError as e:
+                    # An unknown function is a syntax rejection; real
+                    # query failures propagate to the handlers below.
+                    if e.code != "Neo.ClientError.Statement.SyntaxError":
+                        raise
+                    _log_debug("APOC unavailable for tier projection: %s", e.message)
+                    _apoc_map_missing = True
+
+            if _apoc_map_missing:
+                result = await db_connection.execute_query_async(
+                    "MATCH (e:Entity {id: $entity_id}) "
+                    "RETURN labels(e) AS lbls, properties(e) AS props",
+                    {"entity_id": entity_id}
+                )
+                if result:
+                    props = result[0]["props"]
+                    suffix = "_" + tier.lower()
+                    tiered = tuple("_" + s for s in TIER_SUFFIXES)
+                    result = [{
+                        "lbls": result[0]["lbls"],
+                        "tier_props": {k[:-len(suffix)]: v for k, v in props.items()
+                                       if k.endswith(suffix)},
+                        "base_props": {k: v for k, v in props.items()
+                                       if not k.endswith(tiered)},
+                    }]
+
+            if not result:
+                return {
+                    "success": False,
+                    "message": f"Entity with ID '{entity_id}' not found"
+                }
+
+            response = {
+                "success": True,
+                "entity_id": entity_id,
+                "tier": tier,
+                "labels": result[0]["lbls"],
+                "properties": {**result[0]["base_props"], **result[0]["tier_props"]}
+            }
+            _query_cache[cache_key] = response
+            return response
+        except Neo4jError as e:
+            # Driver errors carry a short status code and message;
+            # str(e) would materialize the full server stack trace.
+            _log_error("Failed to get entity with tier: code=%s msg=%s", e.code, e.message)
+            return {
+                "success": False,
+                "error_code": e.code,
+                "message": f"Failed to get entity with tier: {e.message}"
+            }
+        except Exception as e:
+            _log_error("Failed to get entity with tier: %s", e)
+            return {
+                "success": False,
+                "message": f"Failed to get entity with tier: {str(e)}"
+            }
+
+    @server.register_function(
+        name="search_entities",
+        description="Search entities by text across names, descriptions, and notation",
+        parameters=[
+            MCPFunctionParameter(
+                name="query",
+                description="Search terms",
+                required=True
+            ),
+            MCPFunctionParameter(
+                name="entity_types",
+                description="Entity types to search (default: Concept and Symbol)",
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="limit",
+                description=(
+                    f"Maximum number of results (default "
+                    f"{DEFAULT_SEARCH_LIMIT}, cap {MAX_SEARCH_LIMIT})"
+                ),
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="cursor",
+                description="Opaque cursor from a previous page's 'next_cursor'",
+                required=False
+            )
+        ]
+    )
+    async def search_entities(query: str,
+                              entity_types: Optional[List[str]] = None,
+                              limit: int = DEFAULT_SEARCH_LIMIT,
+                              cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Search entities by text across names, descriptions, and notation.
+
+        Args:
+            query (str): Search terms
+            entity_types (Optional[List[str]]): Entity types to search
+            limit (int): Maximum number of results
+            cursor (Optional[str]): Opaque cursor resuming a previous search
+
+        Returns:
+            Dict[str, Any]: Matching entities and the cursor for the next page
+        """
+        _log_debug("Searching entities for '%s'", query)
+
+        try:
+            # Clamp like the sibling list endpoints: an uncapped limit
+            # would sweep the whole fulltext index and park the
+            # oversized response in the cache.
+            limit = min(max(1, int(limit)), MAX_SEARCH_LIMIT)
+
+            # Lowercase once in Python: the fulltext analyzer is
+            # case-insensitive anyway, so this only canonicalizes the
+            # cache key ("Heat" and "heat" share an entry).
+            terms = [t.lower() for t in query.strip().split()]
+
+            # A blank query would otherwise match everything up to
+            # limit — a pointless full index sweep.
+            if not terms:
+                return {
+                    "success": True,
+                    "entities": [],
+                    "count": 0,
+                    "next_cursor": None,
+                    "message": "Empty query"
+                }
+
+            # The cursor is "<score>|<elementId>" of the last returned
+            # row; resuming filters past it instead of re-scanning and
+            # skipping, so page cost is O(limit), not O(offset + limit).
+            cursor_score = None
+            cursor_eid = None
+            if cursor:
+                try:
+                    score_part, _, cursor_eid = cursor.partition("|")
+                    cursor_score = float(score_part)
+                except ValueError:
+                    return {
+                        "success": False,
+                        "message": f"Invalid cursor '{cursor}'"
+                    }
+
+            cache_key = _cache_key("search_entities",
+                                   query=" ".join(terms),
+                                   entity_types=tuple(sorted(entity_types or ())),
+                                   limit=limit,
+                                   cursor=cursor)
+            cached = _query_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # All terms must match (Lucene AND), mirroring the old
+            # per-term CONTAINS conjunction but served by the index.
+            search_query = """
+                CALL db.index.fulltext.queryNodes('entity_fts', $lucene_query)
+                YIELD node AS e, score
+                WHERE any(l IN labels(e) WHERE l IN $entity_types)
+                  AND ($cursor_score IS NULL
+                       OR score < $cursor_score
+                       OR (score = $cursor_score AND elementId(e) > $cursor_eid))
+                RETURN properties(e) AS entity, labels(e) AS labels, score,
+                       elementId(e) AS element_id
+                ORDER BY score DESC, elementId(e)
+                LIMIT $limit
+            """
+            params = {
+                "lucene_query": " AND ".join(terms),
+                "entity_types": entity_types or ["Concept", "Symbol"],
+                "limit": limit,
+                "cursor_score": cursor_score,
+                "cursor_eid": cursor_eid
+            }
+
+            result = await db_connection.execute_query_async(search_query, params)
+
+            entities = [{"entity": record["entity"],
+                         "labels": record["labels"],
+                         "score": record["score"]}
+                        for record in result]
+
+            next_cursor = None
+            if len(result) == limit:
+                last = result[-1]
+                next_cursor = f"{last['score']!r}|{last['element_id']}"
+
+            response = {
+                "success": True,
+                "entities": entities,
+                "count": len(entities),
+                "next_cursor": next_cursor
+            }
+            _query_cache[cache_key] = response
+            return response
+        except Neo4jError as e:
+            # Driver errors carry a short status code and message;
+            # str(e) would materialize the full server stack trace.
+            _log_error("Failed to search entities: code=%s msg=%s", e.code, e.message)
+            return {
+                "success": False,
+                "error_code": e.code,
+                "message": f"Failed to search entities: {e.message}"
+            }
+        except Exception as e:
+            _log_error("Failed to search entities: %s", e)
+            return {
+                "success": False,
+                "message": f"Failed to search entities: {str(e)}"
+            }
+
+    @server.register_function(
+        name="find_paths",
+        description="Find shortest paths between two entities in the knowledge graph",
+        parameters=[
+            MCPFunctionParameter(
+                name="source_id",
+                description="Source entity identifier",
+                required=True
+            ),
+            MCPFunctionParameter(
+                name="target_id",
+                description="Target entity identifier",
+                required=True
+            ),
+            MCPFunctionParameter(
+                name="max_depth",
+                description=f"Maximum traversal depth (default {DEFAULT_MAX_DEPTH})",
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="relationship_types",
+                description="Relationship types to traverse (default: all)",
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="only_one",
+                description=(
+                    "Return at most one shortest path instead of all "
+                    "co-shortest paths (cheaper when only existence and "
+                    "length matter)"
+                ),
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="limit",
+                description=(
+                    f"Maximum number of paths to return "
+                    f"(default and cap {MAX_RETURNED_PATHS})"
+                ),
+                required=False
+            )
+        ]
+    )
+    async def find_paths(source_id: str, target_id: str,
+                         max_depth: int = DEFAULT_MAX_DEPTH,
+                         relationship_types: Optional[List[str]] = None,
+                         only_one: bool = False,
+                         limit: int = MAX_RETURNED_PATHS) -> Dict[str, Any]:
+        """
+        Find shortest paths between two entities in the knowledge graph.
+
+        Args:
+            source_id (str): Source entity identifier
+            target_id (str): Target entity identifier
+            max_depth (int): Maximum traversal depth (capped at 10)
+            relationship_types (Optional[List[str]]): Relationship types to traverse
+            only_one (bool): Return at most one shortest path
+            limit (int): Maximum number of paths to return
+
+        Returns:
+            Dict[str, Any]: Paths between the entities
+        """
+        _log_debug("Finding paths from '%s' to '%s'", source_id, target_id)
+
+        try:
+            # Bounded depth/limit plus the validated, canonicalized
+            # type filter keep the generated text stable across
+            # equivalent calls and the plan-cache footprint small.
+            max_depth = min(max(1, int(max_depth)), MAX_PATH_DEPTH)
+            limit = min(max(1, int(limit)), MAX_RETURNED_PATHS)
+            rel_filter, invalid_types = _build_rel_filter(relationship_types)
+            if invalid_types:
+                return {
+                    "success": False,
+                    "message": f"Invalid relationship types: {invalid_types}"
+                }
+
+            # Deep traversals produce large, rarely repeated results;
+            # only shallow path queries are worth cache space.
+            cache_key = None
+            if max_depth <= MAX_CACHED_PATH_DEPTH:
+                cache_key = _cache_key("find_paths",
+                                       source_id=source_id,
+                                       target_id=target_id,
+                                       max_depth=max_depth,
+                                       rel_filter=rel_filter,
+                                       only_one=only_one,
+                                       limit=limit)
+                cached = _query_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+            # Anchoring both endpoints by unique id first lets the
+            # planner choose StatefulShortestPath(Into) — a
+            # bidirectional BFS that stops when the two frontiers meet,
+            # instead of allShortestPaths' unidirectional sweep.
+            # Paths are deconstructed server-side into plain maps, so
+            # Bolt ships only properties the caller uses (no element
+            # IDs or type metadata) and the driver materializes dicts
+            # directly with no per-node Python reflection.
+            # The canonicalized (selector, rel_filter, max_depth) shape
+            # keys the finished string, so repeated calls skip the
+            # formatting. ANY SHORTEST stops at the first shortest path
+            # found — on high-fanout graphs that avoids enumerating
+            # every co-shortest alternative; the ALL SHORTEST variant is
+            # still capped so one dense pair cannot flood the response.
+            selector = "ANY SHORTEST" if only_one else "ALL SHORTEST"
+            if only_one:
+                limit = 1
+            path_query = _find_paths_cypher(selector, rel_filter, max_depth, limit)
+
+            result = await db_connection.execute_query_async(path_query, {
+                "source_id": source_id,
+                "target_id": target_id
+            })
+
+            # Each record is already a plain {length, nodes,
+            # relationships} map.
+            response = {
+                "success": True,
+                "paths": result,
+                "count": len(result)
+            }
+            if cache_key is not None:
+                _query_cache[cache_key] = response
+            return response
+        except Neo4jError as e:
+            # Driver errors carry a short status code and message;
+            # str(e) would materialize the full server stack trace.
+            _log_error("Failed to find paths: code=%s msg=%s", e.code, e.message)
+            return {
+                "success": False,
+                "error_code": e.code,
+                "message": f"Failed to find paths: {e.message}"
+            }
+        except Exception as e:
+            _log_error("Failed to find paths: %s", e)
+            return {
+                "success": False,
+                "message": f"Failed to find paths: {str(e)}"
+            }
+
+    @server.register_function(
+        name="find_paths_multi",
+        description="Find a shortest path for each of a batch of entity pairs",
+        parameters=[
+            MCPFunctionParameter(
+                name="pairs",
+                description="List of {source_id, target_id} pairs",
+                required=True
+            ),
+            MCPFunctionParameter(
+                name="max_depth",
+                description=f"Maximum traversal depth (default {DEFAULT_MAX_DEPTH})",
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="relationship_types",
+                description="Relationship types to traverse (default: all)",
+                required=False
+            )
+        ]
+    )
+    async def find_paths_multi(pairs: List[Dict[str, str]],
+                               max_depth: int = DEFAULT_MAX_DEPTH,
+                               relationship_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Find a shortest path for each of a batch of entity pairs.
+
+        Multi-hop reasoning workflows resolve many endpoint pairs at
+        once; one UNWIND answers them all in a single round-trip
+        instead of one path query per pair.
+
+        Args:
+            pairs (List[Dict[str, str]]): {source_id, target_id} pairs
+            max_depth (int): Maximum traversal depth (capped at 10)
+            relationship_types (Optional[List[str]]): Relationship types to traverse
+
+        Returns:
+            Dict[str, Any]: Per-pair shortest path results
+        """
+        _log_debug("Finding paths for %d pairs", len(pairs))
+
+        try:
+            max_depth = min(max(1, int(max_depth)), MAX_PATH_DEPTH)
+            rel_filter, invalid_types = _build_rel_filter(relationship_types)
+            if invalid_types:
+                return {
+                    "success": False,
+                    "message": f"Invalid relationship types: {invalid_types}"
+                }
+
+            cache_key = None
+            if max_depth <= MAX_CACHED_PATH_DEPTH:
+                cache_key = _cache_key("find_paths_multi",
+                                       pairs=tuple((p.get("source_id"), p.get("target_id"))
+                                                   for p in pairs),
+                                       max_depth=max_depth,
+                                       rel_filter=rel_filter)
+                cached = _query_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+            # shortestPath (one path per pair) keeps the batch bounded;
+            # OPTIONAL MATCH turns "no path" into a null row instead of
+            # dropping the pair, and list projection over a null path
+            # stays null, so unreachable pairs come back found=false.
+            multi_query = _find_paths_multi_cypher(rel_filter, max_depth)
+
+            result = await db_connection.execute_query_async(multi_query, {
+                "pairs": [{"source_id": p.get("source_id"), "target_id": p.get("target_id")}
+                          for p in pairs]
+            })
+
+            resolved = {(r["source_id"], r["target_id"]) for r in result}
+            results = [{**record, "found": record["length"] is not None}
+                       for record in result]
+            # Pairs with a missing endpoint match nothing at all
+            results.extend(
+                {"source_id": p.get("source_id"), "target_id": p.get("target_id"),
+                 "length": None, "nodes": None, "relationships": None, "found": False}
+                for p in pairs
+                if (p.get("source_id"), p.get("target_id")) not in resolved
+            )
+
+            response = {
+                "success": True,
+                "results": results,
+                "count": len(results)
+            }
+            if cache_key is not None:
+                _query_cache[cache_key] = response
+            return response
+        except Neo4jError as e:
+            # Driver errors carry a short status code and message;
+            # str(e) would materialize the full server stack trace.
+            _log_error("Failed to find paths for pairs: code=%s msg=%s", e.code, e.message)
+            return {
+                "success": False,
+                "error_code": e.code,
+                "message": f"Failed to find paths for pairs: {e.message}"
+            }
+        except Exception as e:
+            _log_error("Failed to find paths for pairs: %s", e)
+            return {
+                "success": False,
+                "message": f"Failed to find paths for pairs: {str(e)}"
+            }
+
+    @server.register_function(
+        name="find_cross_domain_mappings",
+        description="Find cross-domain interpretations of a concept",
+        parameters=[
+            MCPFunctionParameter(
+                name="concept_id",
+                description="Concept identifier",
+                required=True
+            ),
+            MCPFunctionParameter(
+                name="source_domain",
+                description="Domain of the interpreting concepts to filter by",
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="target_domain",
+                description="Domain of the interpreted concepts to filter by",
+                required=False
+            )
+        ]
+    )
+    async def find_cross_domain_mappings(concept_id: str,
+                                         source_domain: Optional[str] = None,
+                                         target_domain: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Find cross-domain interpretations of a concept.
+
+        Args:
+            concept_id (str): Concept identifier
+            source_domain (Optional[str]): Domain of interpreting concepts
+            target_domain (Optional[str]): Domain of interpreted concepts
+
+        Returns:
+            Dict[str, Any]: Cross-domain mappings of the concept
+        """
+        _log_debug("Finding cross-domain mappings for concept '%s'", concept_id)
+
+        try:
+            cache_key = _cache_key("find_cross_domain_mappings",
+                                   concept_id=concept_id,
+                                   source_domain=source_domain,
+                                   target_domain=target_domain)
+            cached = _query_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # Expanding incoming and outgoing edges in one MATCH forms
+            # a Cartesian product (deg_in * deg_out rows) that is only
+            # filtered afterwards. Anchor the concept first and expand
+            # each direction separately, collecting between the two
+            # OPTIONAL MATCHes; the domain predicates then prune each
+            # side independently via the Concept.domain index.
+            query = """
+                MATCH (c:Concept {id: $concept_id})
+                OPTIONAL MATCH (source:Concept)-[r1:HAS_INTERPRETATION_IN]->(c)
+                WHERE $source_domain IS NULL OR source.domain = $source_domain
+                WITH c, collect({concept: properties(source), relationship: properties(r1)}) AS sources
+                OPTIONAL MATCH (c)-[r2:HAS_INTERPRETATION_IN]->(target:Concept)
+                WHERE $target_domain IS NULL OR target.domain = $target_domain
+                RETURN properties(c) AS concept,
+                       sources,
+                       collect({concept: properties(target), relationship: properties(r2)}) AS targets
+            """
+
+            result = await db_connection.execute_query_async(query, {
+                "concept_id": concept_id,
+                "source_domain": source_domain,
+                "target_domain": target_domain
+            })
+
+            if not result:
+                return {
+                    "success": False,
+                    "message": f"Concept with ID '{concept_id}' not found"
+                }
+
+            sources = [s for s in result[0]["sources"] if s["concept"] is not None]
+            targets = [t for t in result[0]["targets"] if t["concept"] is not None]
+
+            response = {
+                "success": True,
+                "concept": result[0]["concept"],
+                "sources": sources,
+                "targets": targets,
+                "count": len(sources) + len(targets)
+            }
+            _query_cache[cache_key] = response
+            return response
+        except Neo4jError as e:
+            # Driver errors carry a short status code and message;
+            # str(e) would materialize the full server stack trace.
+            _log_error("Failed to find cross-domain mappings: code=%s msg=%s", e.code, e.message)
+            return {
+                "success": False,
+                "error_code": e.code,
+                "message": f"Failed to find cross-domain mappings: {e.message}"
+            }
+        except Exception as e:
+            _log_error("Failed to find cross-domain mappings: %s", e)
+            return {
+                "success": False,
+                "message": f"Failed to find cross-domain mappings: {str(e)}"
+            }
+
+    logger.info("Query API endpoints registered")
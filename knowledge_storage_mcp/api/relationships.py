@@ -5,13 +5,20 @@ This module provides endpoints for creating, retrieving, updating,
 and deleting knowledge relationships in the Neo4j database.
 """
 
+import asyncio
+import threading
 import logging
+import uuid
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 
+from cachetools import TTLCache
+
 # MCP SDK imports
 from modelcontextprotocol import MCPServer, MCPFunction, MCPFunctionParameter
 
 # Local imports
+from knowledge_storage_mcp.api.queries import invalidate_query_cache
 from knowledge_storage_mcp.db.connection import Neo4jConnection
 from knowledge_storage_mcp.db.schema import SchemaManager
 from knowledge_storage_mcp.utils.logging import setup_logging
@@ -19,6 +26,113 @@ from knowledge_storage_mcp.utils.logging import setup_logging
 # Setup logging
 logger = setup_logging(__name__)
 
+# Pagination bounds for list_relationships, mirroring the entity API
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Star-shaped ingestion (one hub entity, many edges) probes the same
+# entity ids over and over; a short-TTL cache of known-existing ids and
+# their labels absorbs those repeats. Only positive results are cached
+# — a missing entity may be created a moment later.
+ENTITY_EXISTS_CACHE_SIZE = 4096
+ENTITY_EXISTS_TTL = 30
+
+_entity_exists_cache: TTLCache = TTLCache(maxsize=ENTITY_EXISTS_CACHE_SIZE, ttl=ENTITY_EXISTS_TTL)
+# cachetools caches are not thread-safe and the endpoints touch this
+# one from to_thread workers; all access goes through the lock
+_entity_exists_lock = threading.Lock()
+
+def invalidate_entity_existence(entity_id: str) -> None:
+    """
+    Drop an entity from the existence cache after it is deleted.
+
+    Args:
+        entity_id (str): Entity identifier
+    """
+    with _entity_exists_lock:
+        _entity_exists_cache.pop(entity_id, None)
+
+def _err(message: str) -> Dict[str, Any]:
+    """
+    Build the standard failure response.
+
+    One shared constructor keeps the hot endpoints from assembling a
+    distinct dict literal in every error branch.
+
+    Args:
+        message (str): Failure description
+
+    Returns:
+        Dict[str, Any]: Failure response
+    """
+    return {"success": False, "message": message}
+
+@lru_cache(maxsize=512)
+def _delete_rel_cypher(rel_type: str) -> str:
+    """
+    Build (once per relationship type) the delete statement.
+
+    The whitelist bounds the key space to schema-defined types, so the
+    cache returns the identical string object forever after — no
+    per-call formatting, and the driver sees a stable query text.
+
+    Args:
+        rel_type (str): Relationship type
+
+    Returns:
+        str: Delete Cypher statement
+    """
+    return (
+        "MATCH (s:Entity {id: $from_id})-[r:" + rel_type + "]->(t:Entity {id: $to_id}) "
+        "DELETE r "
+        "RETURN count(r) AS deleted"
+    )
+
+@lru_cache(maxsize=512)
+def _list_rel_cypher(rel_filter: str, direction: str) -> str:
+    """
+    Build (once per filter/direction shape) the list statement.
+
+    Args:
+        rel_filter (str): Relationship filter fragment ('' or ':TYPE')
+        direction (str): 'outgoing', 'incoming', or 'both'
+
+    Returns:
+        str: List Cypher statement
+    """
+    outgoing_branch = (
+        "                    MATCH (s:Entity {id: $entity_id})-[r" + rel_filter + "]->(t:Entity)\n"
+        "                    RETURN s.id AS source_id, type(r) AS relationship_type,\n"
+        "                           t.id AS target_id, properties(r) AS properties,\n"
+        "                           elementId(r) AS element_id\n"
+    )
+    incoming_branch = (
+        "                    MATCH (s:Entity)-[r" + rel_filter + "]->(t:Entity {id: $entity_id})\n"
+        "                    RETURN s.id AS source_id, type(r) AS relationship_type,\n"
+        "                           t.id AS target_id, properties(r) AS properties,\n"
+        "                           elementId(r) AS element_id\n"
+    )
+    if direction == "outgoing":
+        branches = outgoing_branch
+    elif direction == "incoming":
+        branches = incoming_branch
+    else:
+        branches = outgoing_branch + "                    UNION\n" + incoming_branch
+    return (
+        "CALL {\n" + branches + "                }\n"
+        "                WITH source_id, relationship_type, target_id, properties, element_id\n"
+        "                WHERE $after IS NULL OR element_id > $after\n"
+        "                RETURN source_id, relationship_type, target_id, properties, element_id\n"
+        "                ORDER BY element_id\n"
+        "                SKIP $skip LIMIT $limit"
+    )
+
+# Warm the template cache for the unfiltered shapes at import time;
+# typed variants populate lazily, bounded by the schema whitelist.
+for _direction in ("outgoing", "incoming", "both"):
+    _list_rel_cypher("", _direction)
+del _direction
+
 def register_relationship_endpoints(server: MCPServer, db_connection: Neo4jConnection) -> None:
     """
     Register relationship API endpoints with the MCP server.
@@ -30,6 +144,82 @@ def register_relationship_endpoints(server: MCPServer, db_connection: Neo4jConne
     logger.info("Registering relationship API endpoints")
     schema_manager = SchemaManager(db_connection)
     
+    # Pre-bind the connection methods once; each endpoint call then
+    # loads a closure cell instead of doing two attribute lookups on
+    # db_connection per query.
+    _exec_query = db_connection.execute_query
+    _exec_write = db_connection.execute_write_query
+    _stream_query = db_connection.stream_query
+    
+    # Every statement in this module anchors on :Entity(id). Server
+    # startup creates the constraint via SchemaManager.initialize_db,
+    # but registration re-ensures it (IF NOT EXISTS is free) so a
+    # standalone registration can't silently run on label scans —
+    # O(log V) seek vs O(V) scan per anchor. The relationship-id index
+    # backs lookups of the r.id stamped by bulk creates.
+    def _ensure_indexes() -> None:
+        try:
+            db_connection.create_constraint("Entity", "id")
+            _exec_query(
+                "CREATE INDEX rel_id IF NOT EXISTS FOR ()-[r]-() ON (r.id)"
+            )
+        except Exception as e:
+            logger.warning(f"Relationship index setup failed: {str(e)}")
+
+    # Background the DDL so registration does not block startup on the
+    # first Bolt round-trip.
+    threading.Thread(target=_ensure_indexes, name="rel-index-init", daemon=True).start()
+    
+    # The interpolating endpoints gate on this frozenset before any
+    # string work: one O(1) membership test instead of a schema walk,
+    # and nothing outside the defined types ever reaches the Cypher
+    # text (closing the injection vector at the same time).
+    allowed_rel_types = frozenset(schema_manager.get_relationship_types())
+    
+    def _entity_labels(entity_ids: List[str]) -> Dict[str, tuple]:
+        """
+        Get the labels of each existing entity in entity_ids,
+        consulting the existence cache and querying only the uncached
+        ids with a single UNWIND probe.
+        
+        Args:
+            entity_ids (List[str]): Entity identifiers to look up
+        
+        Returns:
+            Dict[str, tuple]: Labels per id; missing entities are absent
+        """
+        with _entity_exists_lock:
+            labels_by_id = {eid: _entity_exists_cache[eid]
+                            for eid in entity_ids if eid in _entity_exists_cache}
+        unknown = [eid for eid in entity_ids if eid not in labels_by_id]
+        if unknown:
+            probe = _exec_query(
+                "UNWIND $ids AS eid "
+                "MATCH (e:Entity {id: eid}) "
+                "RETURN collect({id: eid, labels: labels(e)}) AS found",
+                {"ids": unknown}
+            )
+            found = probe[0]["found"] if probe else []
+            with _entity_exists_lock:
+                for record in found:
+                    labels = tuple(record["labels"])
+                    _entity_exists_cache[record["id"]] = labels
+                    labels_by_id[record["id"]] = labels
+        return labels_by_id
+    
+    def _find_missing_entities(entity_ids: List[str]) -> List[str]:
+        """
+        Return the ids from entity_ids that do not exist.
+        
+        Args:
+            entity_ids (List[str]): Entity identifiers to check
+        
+        Returns:
+            List[str]: Identifiers with no matching entity
+        """
+        labels_by_id = _entity_labels(entity_ids)
+        return [eid for eid in entity_ids if eid not in labels_by_id]
+    
     @server.register_function(
         name="create_relationship",
         description="Create a relationship between two entities in the knowledge graph",
@@ -71,71 +261,416 @@ def register_relationship_endpoints(server: MCPServer, db_connection: Neo4jConne
         Returns:
             Dict[str, Any]: Created relationship information
         """
-        logger.info(f"Creating relationship of type '{relationship_type}' from '{from_entity_id}' to '{to_entity_id}'")
+        logger.debug("Creating relationship of type '%s' from '%s' to '%s'", relationship_type, from_entity_id, to_entity_id)
         
         try:
             # Validate relationship type and properties
             if properties is None:
                 properties = {}
             
-            # Check if entities exist
-            from_query = "MATCH (e:Entity {id: $id}) RETURN e"
-            from_result = db_connection.execute_query(from_query, {"id": from_entity_id})
+            if relationship_type not in allowed_rel_types:
+                return _err(f"Unknown relationship type '{relationship_type}'")
             
-            if not from_result:
-                return {
-                    "success": False,
-                    "message": f"Source entity with ID '{from_entity_id}' not found"
-                }
+            validation = schema_manager.validate_relationship(relationship_type, properties)
+            if not validation["valid"]:
+                return _err(f"Invalid relationship: {'; '.join(validation['errors'])}")
             
-            to_query = "MATCH (e:Entity {id: $id}) RETURN e"
-            to_result = db_connection.execute_query(to_query, {"id": to_entity_id})
+            # One UNWIND (cache-assisted) fetches both endpoint label
+            # sets, so the schema's source/target type rules are
+            # enforced locally without a per-endpoint round-trip.
+            labels_by_id = await asyncio.to_thread(
+                _entity_labels, [from_entity_id, to_entity_id]
+            )
+            if from_entity_id not in labels_by_id:
+                return _err(f"Source entity with ID '{from_entity_id}' not found")
+            if to_entity_id not in labels_by_id:
+                return _err(f"Target entity with ID '{to_entity_id}' not found")
             
-            if not to_result:
-                return {
-                    "success": False,
-                    "message": f"Target entity with ID '{to_entity_id}' not found"
-                }
+            endpoint_validation = schema_manager.validate_relationship_endpoints(
+                relationship_type,
+                labels_by_id[from_entity_id],
+                labels_by_id[to_entity_id]
+            )
+            if not endpoint_validation["valid"]:
+                return _err(f"Invalid relationship: {'; '.join(endpoint_validation['errors'])}")
             
-            # Create relationship
-            create_query = f"""
-                MATCH (source:Entity {{id: $from_id}}), (target:Entity {{id: $to_id}})
-                CREATE (source)-[r:{relationship_type} $properties]->(target)
-                RETURN r
+            # Endpoint validation and the CREATE share one statement:
+            # the MATCH anchors both entities by unique id and produces
+            # no row when either is missing, so the hot path is a
+            # single Bolt round-trip instead of three. The relationship
+            # type goes through apoc.create.relationship as a real
+            # parameter, so every type shares one query text and one
+            # cached plan instead of thrashing the plan cache.
+            create_query = """
+                MATCH (source:Entity {id: $from_id}), (target:Entity {id: $to_id})
+                CALL apoc.create.relationship(source, $rel_type, $properties, target)
+                YIELD rel
+                RETURN labels(source) AS source_labels, labels(target) AS target_labels,
+                       properties(rel) AS rel_properties
             """
             
             params = {
                 "from_id": from_entity_id,
                 "to_id": to_entity_id,
+                "rel_type": relationship_type,
                 "properties": properties
             }
             
-            result = db_connection.execute_query(create_query, params)
+            result = await asyncio.to_thread(_exec_write, create_query, params)
             
             if not result:
-                return {
-                    "success": False,
-                    "message": "Failed to create relationship"
-                }
-            
-            # Extract relationship from result
-            relationship = result[0]["r"]
+                # Endpoints were just verified, so an empty result
+                # means one was deleted concurrently; drop any stale
+                # cache entries and report the failure.
+                invalidate_entity_existence(from_entity_id)
+                invalidate_entity_existence(to_entity_id)
+                return _err("Failed to create relationship")
             
+            # Plain scalar projections keep the Relationship proxy
+            # object (and its element-id/type metadata) off the wire;
+            # the map is already a dict when it lands.
+            # A successful create proves both endpoints exist.
+            with _entity_exists_lock:
+                _entity_exists_cache[from_entity_id] = tuple(result[0]["source_labels"])
+                _entity_exists_cache[to_entity_id] = tuple(result[0]["target_labels"])
+
+            invalidate_query_cache()
+
             return {
                 "success": True,
                 "relationship_type": relationship_type,
                 "from_entity_id": from_entity_id,
                 "to_entity_id": to_entity_id,
-                "properties": properties,
+                "properties": result[0]["rel_properties"],
                 "message": "Relationship created successfully"
             }
         except Exception as e:
-            logger.error(f"Failed to create relationship: {str(e)}")
+            logger.error("Failed to create relationship: %s", e)
+            return _err(f"Failed to create relationship: {str(e)}")
+    
+    @server.register_function(
+        name="create_relationships",
+        description="Create a batch of relationships in the knowledge graph",
+        parameters=[
+            MCPFunctionParameter(
+                name="relationships",
+                description=(
+                    "List of relationships to create, each with 'source_id', "
+                    "'relationship_type', 'target_id', and optional 'properties'"
+                ),
+                required=True
+            )
+        ]
+    )
+    async def create_relationships(relationships: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Create a batch of relationships in the knowledge graph.
+        
+        Args:
+            relationships (List[Dict[str, Any]]): Relationships to create
+        
+        Returns:
+            Dict[str, Any]: Created relationship ids and any failures
+        """
+        logger.debug("Creating %d relationships", len(relationships))
+        
+        try:
+            errors = []
+            # apoc.create.relationship takes the type from the row, so
+            # the whole mixed-type batch shares one UNWIND statement
+            # and one cached plan — per-batch commit cost instead of
+            # per-row, which dominates individual writes at ingestion
+            # scale.
+            rows = []
+            for position, item in enumerate(relationships):
+                rel_type = item.get("relationship_type")
+                properties = item.get("properties") or {}
+                validation = schema_manager.validate_relationship(rel_type, properties)
+                if not validation["valid"]:
+                    errors.append({
+                        "position": position,
+                        "message": "; ".join(validation["errors"])
+                    })
+                    continue
+                rows.append({
+                    "position": position,
+                    "source_id": item.get("source_id"),
+                    "target_id": item.get("target_id"),
+                    "rel_type": rel_type,
+                    "properties": properties,
+                    "id": uuid.uuid4().hex
+                })
+            
+            created = []
+            missing = []
+            if rows:
+                # The same cached UNWIND probe that backs missing-id
+                # reporting resolves every endpoint's labels up front,
+                # so the schema's source/target type rules gate the
+                # batch exactly as they gate single creates.
+                labels_by_id = await asyncio.to_thread(
+                    _entity_labels,
+                    list({eid for row in rows
+                          for eid in (row["source_id"], row["target_id"])})
+                )
+                checked_rows = []
+                for row in rows:
+                    source_labels = labels_by_id.get(row["source_id"])
+                    target_labels = labels_by_id.get(row["target_id"])
+                    if source_labels is None or target_labels is None:
+                        missing.append({**row, "missing_ids": sorted(
+                            eid for eid in (row["source_id"], row["target_id"])
+                            if eid not in labels_by_id)})
+                        continue
+                    endpoint_validation = schema_manager.validate_relationship_endpoints(
+                        row["rel_type"], source_labels, target_labels
+                    )
+                    if not endpoint_validation["valid"]:
+                        errors.append({
+                            "position": row["position"],
+                            "message": "; ".join(endpoint_validation["errors"])
+                        })
+                        continue
+                    checked_rows.append(row)
+                rows = checked_rows
+            
+            if rows:
+                create_query = """
+                    UNWIND $rows AS row
+                    MATCH (s:Entity {id: row.source_id}), (t:Entity {id: row.target_id})
+                    CALL apoc.create.relationship(s, row.rel_type, row.properties, t)
+                    YIELD rel
+                    SET rel.id = row.id
+                    RETURN row.id AS id
+                """
+                result = await asyncio.to_thread(_exec_write, create_query, {"rows": rows})
+                created_ids = {record["id"] for record in result}
+                created.extend(created_ids)
+                # Rows whose endpoints did not match produce no record;
+                # the cached probe narrows down which ids are missing.
+                failed_rows = [row for row in rows if row["id"] not in created_ids]
+                if failed_rows:
+                    missing_ids = set(await asyncio.to_thread(
+                        _find_missing_entities,
+                        [eid for row in failed_rows
+                         for eid in (row["source_id"], row["target_id"])]
+                    ))
+                    missing.extend(
+                        {**row, "missing_ids": sorted(
+                            {row["source_id"], row["target_id"]} & missing_ids)}
+                        for row in failed_rows
+                    )
+            
+            if created:
+                invalidate_query_cache()
+            
             return {
-                "success": False,
-                "message": f"Failed to create relationship: {str(e)}"
+                "success": not errors and not missing,
+                "created_ids": created,
+                "created_count": len(created),
+                "missing": [
+                    {"source_id": row["source_id"], "target_id": row["target_id"],
+                     "missing_ids": row["missing_ids"]}
+                    for row in missing
+                ],
+                "errors": errors
             }
+        except Exception as e:
+            logger.error("Failed to create relationships: %s", e)
+            return _err(f"Failed to create relationships: {str(e)}")
     
-    # Add more relationship endpoints (get, delete, list) here
+    @server.register_function(
+        name="delete_relationship",
+        description="Delete a relationship between two entities in the knowledge graph",
+        parameters=[
+            MCPFunctionParameter(
+                name="from_entity_id",
+                description="Source entity identifier",
+                required=True
+            ),
+            MCPFunctionParameter(
+                name="relationship_type",
+                description="Type of relationship to delete",
+                required=True
+            ),
+            MCPFunctionParameter(
+                name="to_entity_id",
+                description="Target entity identifier",
+                required=True
+            )
+        ]
+    )
+    async def delete_relationship(from_entity_id: str, relationship_type: str,
+                                to_entity_id: str) -> Dict[str, Any]:
+        """
+        Delete a relationship between two entities in the knowledge graph.
+        
+        Args:
+            from_entity_id (str): Source entity identifier
+            relationship_type (str): Type of relationship to delete
+            to_entity_id (str): Target entity identifier
+        
+        Returns:
+            Dict[str, Any]: Deletion outcome
+        """
+        logger.debug("Deleting relationship of type '%s' from '%s' to '%s'", relationship_type, from_entity_id, to_entity_id)
+        
+        try:
+            # The type must still be interpolated here (DELETE has no
+            # APOC equivalent worth a procedure call); the whitelist
+            # bounds the query-text space to the defined types.
+            if relationship_type not in allowed_rel_types:
+                return _err(f"Unknown relationship type '{relationship_type}'")
+            
+            # One write statement: the returned count authoritatively
+            # reports the outcome, so no prior existence read (and no
+            # race against concurrent deletes) is needed.
+            delete_query = _delete_rel_cypher(relationship_type)
+            
+            params = {
+                "from_id": from_entity_id,
+                "to_id": to_entity_id
+            }
+            
+            result = await asyncio.to_thread(_exec_write, delete_query, params)
+            deleted = result[0]["deleted"] if result else 0
+            
+            if not deleted:
+                return {
+                    "success": False,
+                    "message": (
+                        f"Relationship of type '{relationship_type}' from "
+                        f"'{from_entity_id}' to '{to_entity_id}' not found"
+                    )
+                }
+            
+            invalidate_query_cache()
+            
+            return {
+                "success": True,
+                "deleted_count": deleted,
+                "message": "Relationship deleted successfully"
+            }
+        except Exception as e:
+            logger.error("Failed to delete relationship: %s", e)
+            return _err(f"Failed to delete relationship: {str(e)}")
+    
+    @server.register_function(
+        name="list_relationships",
+        description="List the relationships of an entity, with pagination",
+        parameters=[
+            MCPFunctionParameter(
+                name="entity_id",
+                description="Entity identifier",
+                required=True
+            ),
+            MCPFunctionParameter(
+                name="relationship_type",
+                description="Relationship type to filter by (default: all)",
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="direction",
+                description="Direction to list: 'outgoing', 'incoming', or 'both' (default)",
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="after",
+                description="Opaque cursor from a previous page's 'next_cursor'",
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="skip",
+                description="Number of relationships to skip (legacy; prefer 'after')",
+                required=False
+            ),
+            MCPFunctionParameter(
+                name="limit",
+                description=f"Maximum number of relationships to return (default {DEFAULT_PAGE_SIZE})",
+                required=False
+            )
+        ]
+    )
+    async def list_relationships(entity_id: str,
+                                relationship_type: Optional[str] = None,
+                                direction: str = "both",
+                                after: Optional[str] = None,
+                                skip: int = 0,
+                                limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        List the relationships of an entity, with pagination.
+        
+        Args:
+            entity_id (str): Entity identifier
+            relationship_type (Optional[str]): Relationship type to filter by
+            direction (str): 'outgoing', 'incoming', or 'both'
+            after (Optional[str]): Opaque cursor resuming a previous page
+            skip (int): Number of relationships to skip (legacy offset paging)
+            limit (int): Maximum number of relationships to return
+        
+        Returns:
+            Dict[str, Any]: Relationships, a has_next flag, and next_cursor
+        """
+        logger.debug("Listing relationships of entity '%s'", entity_id)
+        
+        try:
+            if direction not in ("outgoing", "incoming", "both"):
+                return _err(f"Invalid direction '{direction}' (expected 'outgoing', 'incoming', or 'both')")
+            
+            skip = max(0, int(skip))
+            limit = min(max(1, int(limit)), MAX_PAGE_SIZE)
+            
+            if relationship_type and relationship_type not in allowed_rel_types:
+                return _err(f"Unknown relationship type '{relationship_type}'")
+            
+            rel_filter = f":{relationship_type}" if relationship_type else ""
+            
+            # Each direction is a complete MATCH ... RETURN branch, so
+            # both anchor on the entity-id index; UNION inside CALL {}
+            # lets one SKIP/LIMIT paginate the merged stream. Skip and
+            # limit stay parameters so the plan is cached per template,
+            # and the template itself comes from the lru_cache — one
+            # extra row decides has_next, so no separate count(*) scan
+            # is needed just to paginate.
+            list_query = _list_rel_cypher(rel_filter, direction)
+            
+            # Keyset paging: the cursor filters past the last row of
+            # the previous page, so page cost stays O(limit) instead of
+            # O(skip + limit). The skip offset remains for callers
+            # still on the old paging scheme.
+            params = {
+                "entity_id": entity_id,
+                "after": after,
+                "skip": 0 if after else skip,
+                "limit": limit + 1
+            }
+            
+            # Stream records off the cursor instead of materializing
+            # the driver's full buffer and then copying it: the page
+            # list is the only allocation, and the extra has_next row
+            # is observed without ever being stored. Breaking out
+            # closes the generator and with it the session.
+            def _collect_page() -> tuple:
+                page: List[Dict[str, Any]] = []
+                for record in _stream_query(list_query, params):
+                    if len(page) < limit:
+                        page.append(record)
+                    else:
+                        return page, True
+                return page, False
+            
+            page, has_next = await asyncio.to_thread(_collect_page)
+            
+            return {
+                "success": True,
+                "entity_id": entity_id,
+                "relationships": page,
+                "count": len(page),
+                "has_next": has_next,
+                "next_cursor": page[-1]["element_id"] if has_next and page else None
+            }
+        except Exception as e:
+            logger.error("Failed to list relationships: %s", e)
+            return _err(f"Failed to list relationships: {str(e)}")
     
     logger.info("Relationship API endpoints registered")
@@ -0,0 +1,43 @@
+"""
+Configuration for the Knowledge Storage MCP.
+
+This module loads the server and database settings from the environment
+(including a .env file) exactly once per process.
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import dotenv
+
+@dataclass(frozen=True)
+class Settings:
+    """Process-wide server and database settings."""
+
+    host: str
+    port: int
+    neo4j_uri: str
+    neo4j_username: str
+    neo4j_password: Optional[str]
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load the settings from the environment, once per process.
+
+    The .env file is parsed on the first call only; repeated server
+    construction (tests, reloads) reuses the frozen instance.
+
+    Returns:
+        Settings: The cached settings instance
+    """
+    dotenv.load_dotenv()
+    return Settings(
+        host=os.getenv("MCP_HOST", "0.0.0.0"),
+        port=int(os.getenv("MCP_PORT", "8000")),
+        neo4j_uri=os.getenv("NEO4J_URI", "bolt://localhost:7687"),
+        neo4j_username=os.getenv("NEO4J_USERNAME", "neo4j"),
+        neo4j_password=os.getenv("NEO4J_PASSWORD"),
+    )
@@ -5,16 +5,47 @@ This module provides a connection to the Neo4j graph database
 for storing and retrieving knowledge entities and relationships.
 """
 
+import atexit
 import logging
+import os
+import re
+import threading
+import time
 from typing import Dict, Any, List, Optional, Union
 
-from neo4j import GraphDatabase, Driver, Session, Result
+from cachetools import TTLCache
+
+from neo4j import AsyncGraphDatabase, GraphDatabase, Driver, Session, Result
+from neo4j.exceptions import Neo4jError
 
 from knowledge_storage_mcp.utils.logging import setup_logging
 
 # Setup logging
 logger = setup_logging(__name__)
 
+# Bolt connection pool defaults; overridable per instance or via the
+# NEO4J_MAX_POOL_SIZE / NEO4J_ACQ_TIMEOUT environment variables
+DEFAULT_MAX_POOL_SIZE = 50
+DEFAULT_ACQUISITION_TIMEOUT = 60.0
+DEFAULT_MAX_CONN_LIFETIME = 3600.0
+DEFAULT_CONNECTION_TIMEOUT = 5.0
+
+# Default target database; sessions that name their database skip the
+# per-query server-side home-database lookup
+DEFAULT_DATABASE = "neo4j"
+
+# Result cache for execute_read_query; short TTL bounds staleness from
+# writes the coarse invalidation cannot see
+READ_CACHE_SIZE = int(os.getenv("NEO4J_READ_CACHE_SIZE", "1024"))
+READ_CACHE_TTL = float(os.getenv("NEO4J_READ_CACHE_TTL", "30"))
+
+# Seconds between background connectivity probes
+DEFAULT_HEALTH_PROBE_INTERVAL = 30.0
+
+# Labels and property names are interpolated into DDL text (Cypher has
+# no identifier parameters), so they must look like plain identifiers
+_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
 class Neo4jConnection:
     """
     Neo4j database connection handler.
@@ -23,7 +54,11 @@ class Neo4jConnection:
     methods for executing Cypher queries and transactions.
     """
     
-    def __init__(self, uri: str, username: str, password: str):
+    def __init__(self, uri: str, username: str, password: str,
+                 database: Optional[str] = None,
+                 max_connection_pool_size: Optional[int] = None,
+                 connection_acquisition_timeout: Optional[float] = None,
+                 max_connection_lifetime: Optional[float] = None):
         """
         Initialize the Neo4j connection.
         
@@ -31,15 +66,75 @@ class Neo4jConnection:
             uri: Neo4j connection URI
             username: Neo4j username
             password: Neo4j password
+            database: Target database name (default: from NEO4J_DATABASE
+                or 'neo4j')
+            max_connection_pool_size: Maximum Bolt connections in the
+                driver pool (default: from NEO4J_MAX_POOL_SIZE or 50)
+            connection_acquisition_timeout: Seconds to wait for a pooled
+                connection (default: from NEO4J_ACQ_TIMEOUT or 60.0)
+            max_connection_lifetime: Seconds before a pooled connection
+                is retired (default: from NEO4J_MAX_CONN_LIFETIME_S or 3600)
         """
         self.uri = uri
         self.username = username
         self.password = password
+        self.database = database or os.getenv("NEO4J_DATABASE", DEFAULT_DATABASE)
+        # Under concurrent MCP load the pool, not the queries, is the
+        # first bottleneck: an undersized pool queues requests behind
+        # connection acquisition, so both knobs are operator-tunable.
+        self.max_connection_pool_size = (
+            max_connection_pool_size
+            if max_connection_pool_size is not None
+            else int(os.getenv("NEO4J_MAX_POOL_SIZE", str(DEFAULT_MAX_POOL_SIZE)))
+        )
+        self.connection_acquisition_timeout = (
+            connection_acquisition_timeout
+            if connection_acquisition_timeout is not None
+            else float(os.getenv("NEO4J_ACQ_TIMEOUT", str(DEFAULT_ACQUISITION_TIMEOUT)))
+        )
+        # Retiring connections before server/LB idle timeouts (and TCP
+        # keep-alives in between) avoids the stalls caused by handing a
+        # dead socket to a request.
+        self.max_connection_lifetime = (
+            max_connection_lifetime
+            if max_connection_lifetime is not None
+            else float(os.getenv("NEO4J_MAX_CONN_LIFETIME_S", str(DEFAULT_MAX_CONN_LIFETIME)))
+        )
         self.driver = None
+        self._async_driver = None
+        # One long-lived read session per worker thread; sessions are
+        # cheap but reusing one still skips per-call setup on the hot
+        # read path. Writes keep short-lived sessions.
+        self._tls = threading.local()
+        self._read_cache = TTLCache(maxsize=READ_CACHE_SIZE, ttl=READ_CACHE_TTL)
+        self._read_cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # DDL already submitted through the create_* helpers; repeats
+        # are skipped without a round-trip
+        self._created_schema: set = set()
+        # Last background-probe result; None until the monitor runs
+        self._healthy: Optional[bool] = None
+        self._health_thread: Optional[threading.Thread] = None
+        # Set once the server rejects CONCURRENT TRANSACTIONS syntax
+        self._no_concurrent_tx = False
         
         try:
-            self.driver = GraphDatabase.driver(uri, auth=(username, password))
+            self.driver = GraphDatabase.driver(
+                uri,
+                auth=(username, password),
+                max_connection_pool_size=self.max_connection_pool_size,
+                connection_acquisition_timeout=self.connection_acquisition_timeout,
+                max_connection_lifetime=self.max_connection_lifetime,
+                connection_timeout=DEFAULT_CONNECTION_TIMEOUT,
+                keep_alive=True,
+            )
             logger.info(f"Connected to Neo4j at {uri}")
+            logger.info(
+                f"Bolt pool: max_connection_pool_size={self.max_connection_pool_size}, "
+                f"connection_acquisition_timeout={self.connection_acquisition_timeout}s, "
+                f"max_connection_lifetime={self.max_connection_lifetime}s"
+            )
         except Exception as e:
             logger.error(f"Failed to connect to Neo4j: {str(e)}")
             raise
@@ -54,6 +149,99 @@ class Neo4jConnection:
         """Get the Neo4j driver instance."""
         return self.driver
     
+    def is_connected(self) -> bool:
+        """
+        Check whether the database is reachable.
+        
+        Uses the driver's built-in verify_connectivity, which reuses a
+        pooled connection for the liveness check instead of opening a
+        session and running a throwaway query.
+        
+        Returns:
+            True if the server responds, False otherwise
+        """
+        try:
+            self.driver.verify_connectivity()
+            return True
+        except Exception as e:
+            logger.warning(f"Neo4j connectivity check failed: {str(e)}")
+            return False
+    
+    def get_async_driver(self):
+        """Get the Neo4j async driver, creating it on first use."""
+        if self._async_driver is None:
+            self._async_driver = AsyncGraphDatabase.driver(
+                self.uri,
+                auth=(self.username, self.password),
+                max_connection_pool_size=self.max_connection_pool_size,
+                connection_acquisition_timeout=self.connection_acquisition_timeout,
+                max_connection_lifetime=self.max_connection_lifetime,
+                connection_timeout=DEFAULT_CONNECTION_TIMEOUT,
+                keep_alive=True,
+            )
+        return self._async_driver
+    
+    async def close_async(self):
+        """Close the async Neo4j driver if it was created."""
+        if self._async_driver:
+            await self._async_driver.close()
+            self._async_driver = None
+    
+    async def execute_query_async(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a Cypher query on the async driver and return the results.
+        
+        Sessions are drawn from the async driver's connection pool, so
+        many in-flight queries overlap on one event loop instead of
+        serializing behind blocking Bolt I/O.
+        
+        Args:
+            query: Cypher query string
+            parameters: Query parameters
+        
+        Returns:
+            List of query result records as dictionaries
+        """
+        if parameters is None:
+            parameters = {}
+        
+        try:
+            async with self.get_async_driver().session(database=self.database) as session:
+                result = await session.run(query, parameters)
+                return [record.data() async for record in result]
+        except Exception as e:
+            logger.error(f"Query execution failed: {str(e)}\nQuery: {query}\nParameters: {parameters}")
+            raise
+    
+    async def execute_write_query_async(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a Cypher write query asynchronously in a write transaction.
+        
+        Async counterpart of execute_write_query: writer routing and
+        driver-managed retries, without holding a thread for the
+        round-trip.
+        
+        Args:
+            query: Cypher query string
+            parameters: Query parameters
+        
+        Returns:
+            List of query result records as dictionaries
+        """
+        if parameters is None:
+            parameters = {}
+        
+        async def _work(tx):
+            result = await tx.run(query, parameters)
+            return [record.data() async for record in result]
+        
+        try:
+            async with self.get_async_driver().session(database=self.database) as session:
+                return await session.execute_write(_work)
+        except Exception as e:
+            logger.error(f"Write query execution failed: {str(e)}\nQuery: {query}\nParameters: {parameters}")
+            raise
+    
     def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Execute a Cypher query and return the results.
@@ -69,13 +257,317 @@ class Neo4jConnection:
             parameters = {}
         
         try:
-            with self.driver.session() as session:
+            with self.driver.session(database=self.database) as session:
                 result = session.run(query, parameters)
                 return [record.data() for record in result]
         except Exception as e:
             logger.error(f"Query execution failed: {str(e)}\nQuery: {query}\nParameters: {parameters}")
             raise
     
+    def execute_query_rows(self, query: str, parameters: Optional[Dict[str, Any]] = None):
+        """
+        Execute a Cypher query and return results as keys plus tuples.
+        
+        Skips the per-record dict that record.data() builds — one tuple
+        per row instead of a dict with copied string keys — which is
+        the dominant materialization cost on large scans. Callers that
+        want dicts can zip each row with the returned keys.
+        
+        Args:
+            query: Cypher query string
+            parameters: Query parameters
+        
+        Returns:
+            Tuple of (column keys, list of row value tuples)
+        """
+        if parameters is None:
+            parameters = {}
+        
+        try:
+            with self.driver.session(database=self.database) as session:
+                result = session.run(query, parameters)
+                keys = list(result.keys())
+                rows = [tuple(record.values()) for record in result]
+                return keys, rows
+        except Exception as e:
+            logger.error(f"Query execution failed: {str(e)}\nQuery: {query}\nParameters: {parameters}")
+            raise
+    
+    def stream_query(self, query: str, parameters: Optional[Dict[str, Any]] = None):
+        """
+        Execute a Cypher query and yield result records one at a time.
+        
+        Unlike execute_query, records are not buffered into an
+        intermediate list; the session stays open until the generator
+        is exhausted or closed.
+        
+        Args:
+            query: Cypher query string
+            parameters: Query parameters
+        
+        Yields:
+            Query result records as dictionaries
+        """
+        if parameters is None:
+            parameters = {}
+        
+        try:
+            with self.driver.session(database=self.database) as session:
+                for record in session.run(query, parameters):
+                    yield record.data()
+        except Exception as e:
+            logger.error(f"Query execution failed: {str(e)}\nQuery: {query}\nParameters: {parameters}")
+            raise
+    
+    def execute_bulk(self, query: str, rows: List[Dict[str, Any]], batch_size: int = 5000) -> int:
+        """
+        Execute an UNWIND-style bulk write over a list of rows.
+        
+        The query must consume a $rows parameter (typically
+        "UNWIND $rows AS row ..."). Rows are chunked so that arbitrarily
+        large inputs neither exceed the server's transaction memory nor
+        serialize one row per round-trip.
+        
+        Args:
+            query: Cypher query string referencing $rows
+            rows: Parameter dictionaries, one per row
+            batch_size: Maximum rows per transaction (default: 5000)
+        
+        Returns:
+            Number of rows submitted
+        """
+        if not rows:
+            return 0
+        
+        try:
+            with self.driver.session(database=self.database) as session:
+                for start in range(0, len(rows), batch_size):
+                    chunk = rows[start:start + batch_size]
+                    session.execute_write(
+                        lambda tx, chunk=chunk: tx.run(query, rows=chunk).consume()
+                    )
+            self.invalidate_read_cache()
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Bulk query execution failed: {str(e)}\nQuery: {query}\nRows: {len(rows)}")
+            raise
+    
+    def execute_bulk_concurrent(self, inner: str, rows: List[Dict[str, Any]],
+                                batch_size: int = 1000, concurrency: int = 4) -> int:
+        """
+        Execute a bulk write with server-side concurrent batching.
+        
+        Wraps the inner Cypher in CALL { ... } IN CONCURRENT
+        TRANSACTIONS (Neo4j 5.21+), which spreads the batches across
+        server threads without any client-side thread management. On
+        servers that reject the syntax this falls back to sequential
+        IN TRANSACTIONS batching and remembers the answer.
+        
+        Args:
+            inner: Cypher fragment operating on a single 'row' variable
+            rows: Parameter dictionaries, one per row
+            batch_size: Rows per server-side transaction (default: 1000)
+            concurrency: Concurrent transactions (default: 4)
+        
+        Returns:
+            Number of rows submitted
+        """
+        if not rows:
+            return 0
+        
+        concurrent_query = (
+            f"UNWIND $rows AS row CALL {{ WITH row {inner} }} "
+            f"IN {int(concurrency)} CONCURRENT TRANSACTIONS OF {int(batch_size)} ROWS"
+        )
+        sequential_query = (
+            f"UNWIND $rows AS row CALL {{ WITH row {inner} }} "
+            f"IN TRANSACTIONS OF {int(batch_size)} ROWS"
+        )
+        
+        try:
+            # IN TRANSACTIONS requires an implicit (auto-commit)
+            # transaction, so this cannot go through execute_write.
+            with self.driver.session(database=self.database) as session:
+                if not self._no_concurrent_tx:
+                    try:
+                        session.run(concurrent_query, rows=rows).consume()
+                        self.invalidate_read_cache()
+                        return len(rows)
+                    except Neo4jError as e:
+                        # Only a syntax rejection means the server lacks
+                        # the feature. Anything else (constraint
+                        # violation, transient failure) may have already
+                        # committed some batches — re-running the whole
+                        # input sequentially would duplicate them.
+                        if e.code != "Neo.ClientError.Statement.SyntaxError":
+                            raise
+                        logger.warning(
+                            f"Concurrent transactions unsupported, falling back: {str(e)}"
+                        )
+                        self._no_concurrent_tx = True
+                session.run(sequential_query, rows=rows).consume()
+            self.invalidate_read_cache()
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Bulk query execution failed: {str(e)}\nInner: {inner}\nRows: {len(rows)}")
+            raise
+    
+    def execute_read_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a Cypher read query inside a read transaction.
+        
+        Routes to a reader in a cluster and gets driver-managed retries;
+        use this for pure reads so they stay off the writer.
+        
+        Args:
+            query: Cypher query string
+            parameters: Query parameters
+        
+        Returns:
+            List of query result records as dictionaries
+        """
+        if parameters is None:
+            parameters = {}
+        
+        # Unhashable parameter values (lists, dicts) simply bypass the
+        # cache rather than failing the query.
+        try:
+            key = (query, tuple(sorted(parameters.items())))
+        except TypeError:
+            key = None
+        
+        if key is not None:
+            with self._read_cache_lock:
+                cached = self._read_cache.get(key)
+                if cached is not None:
+                    self._cache_hits += 1
+                    return cached
+                self._cache_misses += 1
+        
+        try:
+            result = self._thread_session().execute_read(
+                lambda tx: [record.data() for record in tx.run(query, parameters)]
+            )
+        except Exception as e:
+            # A dead socket can poison a reused session; rebuild it on
+            # the next call from this thread.
+            self._drop_thread_session()
+            logger.error(f"Read query execution failed: {str(e)}\nQuery: {query}\nParameters: {parameters}")
+            raise
+        
+        if key is not None:
+            with self._read_cache_lock:
+                self._read_cache[key] = result
+        return result
+    
+    def start_health_monitor(self, interval: Optional[float] = None) -> None:
+        """
+        Start a background thread that probes connectivity periodically.
+        
+        The probe result is cached on the instance so health checks can
+        read a flag instead of paying a Bolt round-trip per call.
+        
+        Args:
+            interval: Seconds between probes (default: from
+                NEO4J_HEALTH_PROBE_INTERVAL_S or 30.0)
+        """
+        if self._health_thread is not None and self._health_thread.is_alive():
+            return
+        if interval is None:
+            interval = float(
+                os.getenv("NEO4J_HEALTH_PROBE_INTERVAL_S", str(DEFAULT_HEALTH_PROBE_INTERVAL))
+            )
+        
+        def _probe_loop():
+            while True:
+                self._healthy = self.is_connected()
+                time.sleep(interval)
+        
+        self._health_thread = threading.Thread(
+            target=_probe_loop, name="neo4j-health-probe", daemon=True
+        )
+        self._health_thread.start()
+        logger.info(f"Health monitor started (interval={interval}s)")
+    
+    @property
+    def healthy(self) -> bool:
+        """
+        Last known connectivity state.
+        
+        Reads the cached probe result when the monitor is running;
+        falls back to a live check before the first probe completes.
+        """
+        if self._healthy is None:
+            return self.is_connected()
+        return self._healthy
+    
+    def _thread_session(self) -> Session:
+        """Get (or lazily create) this thread's long-lived read session."""
+        session = getattr(self._tls, "session", None)
+        if session is None:
+            session = self.driver.session(database=self.database)
+            self._tls.session = session
+        return session
+    
+    def _drop_thread_session(self):
+        """Close and forget this thread's read session after a failure."""
+        session = getattr(self._tls, "session", None)
+        if session is not None:
+            self._tls.session = None
+            try:
+                session.close()
+            except Exception:
+                pass
+    
+    def invalidate_read_cache(self):
+        """Drop all cached read-query results."""
+        with self._read_cache_lock:
+            self._read_cache.clear()
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Get hit/miss counters for the read-query result cache.
+        
+        Returns:
+            Dictionary with 'hits', 'misses', and current 'size'
+        """
+        with self._read_cache_lock:
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "size": len(self._read_cache),
+            }
+    
+    def execute_write_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a Cypher write query inside a write transaction.
+        
+        Unlike execute_query's auto-commit session, this routes to the
+        cluster writer and participates in the driver's bookmark chain,
+        so reads that follow observe the write (causal consistency) and
+        transient failures are retried by the driver.
+        
+        Args:
+            query: Cypher query string
+            parameters: Query parameters
+        
+        Returns:
+            List of query result records as dictionaries
+        """
+        if parameters is None:
+            parameters = {}
+        
+        try:
+            with self.driver.session(database=self.database) as session:
+                result = session.execute_write(
+                    lambda tx: [record.data() for record in tx.run(query, parameters)]
+                )
+        except Exception as e:
+            logger.error(f"Write query execution failed: {str(e)}\nQuery: {query}\nParameters: {parameters}")
+            raise
+        self.invalidate_read_cache()
+        return result
+    
     def execute_transaction(self, function, *args, **kwargs) -> Any:
         """
         Execute a function within a transaction.
@@ -89,7 +581,7 @@ class Neo4jConnection:
             Result of the transaction function
         """
         try:
-            with self.driver.session() as session:
+            with self.driver.session(database=self.database) as session:
                 return session.execute_write(function, *args, **kwargs)
         except Exception as e:
             logger.error(f"Transaction execution failed: {str(e)}")
@@ -108,12 +600,46 @@ class Neo4jConnection:
             Result of the transaction function
         """
         try:
-            with self.driver.session() as session:
+            with self.driver.session(database=self.database) as session:
                 return session.execute_read(function, *args, **kwargs)
         except Exception as e:
             logger.error(f"Read transaction execution failed: {str(e)}")
             raise
     
+    def run_statements(self, statements: List[str]) -> None:
+        """
+        Execute a list of statements over one pooled session.
+        
+        Schema DDL must auto-commit per statement, but reusing a single
+        session means one connection acquisition for the whole batch
+        instead of a session/round-trip per statement.
+        
+        Args:
+            statements: Cypher statements to execute in order
+        """
+        try:
+            with self.driver.session(database=self.database) as session:
+                for statement in statements:
+                    session.run(statement).consume()
+        except Exception as e:
+            logger.error(f"Statement batch execution failed: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _check_identifiers(*names: str) -> None:
+        """
+        Validate labels and property names used in generated DDL.
+        
+        Args:
+            names: Identifiers about to be interpolated into DDL text
+        
+        Raises:
+            ValueError: If any identifier is not a plain word
+        """
+        for name in names:
+            if not _IDENT_RE.match(name):
+                raise ValueError(f"Invalid schema identifier: {name!r}")
+    
     def create_constraint(self, label: str, property_name: str) -> None:
         """
         Create a uniqueness constraint for a node label and property.
@@ -122,9 +648,14 @@ class Neo4jConnection:
             label: Node label
             property_name: Property name for the constraint
         """
+        self._check_identifiers(label, property_name)
+        key = ("constraint", label, property_name)
+        if key in self._created_schema:
+            return
         try:
             query = f"CREATE CONSTRAINT IF NOT EXISTS FOR (n:{label}) REQUIRE n.{property_name} IS UNIQUE"
             self.execute_query(query)
+            self._created_schema.add(key)
             logger.info(f"Created constraint on {label}.{property_name}")
         except Exception as e:
             logger.error(f"Failed to create constraint: {str(e)}")
@@ -138,10 +669,70 @@ class Neo4jConnection:
             label: Node label
             property_name: Property name for the index
         """
+        self._check_identifiers(label, property_name)
+        key = ("index", label, property_name)
+        if key in self._created_schema:
+            return
         try:
             query = f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) ON (n.{property_name})"
             self.execute_query(query)
+            self._created_schema.add(key)
             logger.info(f"Created index on {label}.{property_name}")
         except Exception as e:
             logger.error(f"Failed to create index: {str(e)}")
             raise
+    
+    def create_composite_index(self, label: str, property_names: List[str]) -> None:
+        """
+        Create a composite index for a node label and several properties.
+        
+        Args:
+            label: Node label
+            property_names: Property names for the index, in order
+        """
+        self._check_identifiers(label, *property_names)
+        key = ("index", label, tuple(property_names))
+        if key in self._created_schema:
+            return
+        try:
+            props = ", ".join(f"n.{name}" for name in property_names)
+            query = f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) ON ({props})"
+            self.execute_query(query)
+            self._created_schema.add(key)
+            logger.info(f"Created composite index on {label}({', '.join(property_names)})")
+        except Exception as e:
+            logger.error(f"Failed to create composite index: {str(e)}")
+            raise
+
+
+# Process-wide shared connection; the Neo4j driver is thread-safe and
+# one driver means one Bolt pool instead of one per caller
+_db_connection: Optional[Neo4jConnection] = None
+_db_lock = threading.Lock()
+
+def get_db_connection() -> Neo4jConnection:
+    """
+    Get the process-wide Neo4jConnection, creating it on first use.
+    
+    Configuration comes from the NEO4J_URI, NEO4J_USERNAME and
+    NEO4J_PASSWORD environment variables. Double-checked locking keeps
+    concurrent first callers from racing to build two drivers.
+    
+    Returns:
+        The shared Neo4jConnection instance
+    """
+    global _db_connection
+    if _db_connection is None:
+        with _db_lock:
+            if _db_connection is None:
+                password = os.getenv("NEO4J_PASSWORD")
+                if not password:
+                    raise ValueError("Neo4j password must be provided")
+                connection = Neo4jConnection(
+                    uri=os.getenv("NEO4J_URI", "bolt://localhost:7687"),
+                    username=os.getenv("NEO4J_USERNAME", "neo4j"),
+                    password=password,
+                )
+                atexit.register(connection.close)
+                _db_connection = connection
+    return _db_connection
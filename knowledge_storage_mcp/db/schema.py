@@ -0,0 +1,502 @@
+"""
+Schema management for the Knowledge Storage MCP.
+
+This module loads the entity and relationship type definitions from the
+schema files and provides validation and database schema initialization
+for the Neo4j graph database.
+"""
+
+import json
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+from cachetools import LRUCache
+
+from knowledge_storage_mcp.db.connection import Neo4jConnection
+from knowledge_storage_mcp.utils.logging import setup_logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Setup logging
+logger = setup_logging(__name__)
+
+# Location of the schema definition files
+SCHEMA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "schemas",
+)
+
+# Composite lookup indexes for the hot (type, property-set) shapes used
+# by property lookups; without them Neo4j falls back to a label scan.
+COMPOSITE_LOOKUP_INDEXES = {
+    "Concept": [("name", "domain")],
+    "Symbol": [("notation", "context")],
+    "Document": [("title",)],
+}
+
+# Bound on the relationship signature memo; signatures embed
+# caller-supplied property-key sets, so the space is not finite
+REL_SIG_CACHE_SIZE = 2048
+
+# Schema type name -> Python type(s) accepted for the property value.
+# One dict lookup plus one isinstance replaces the former five-branch
+# elif ladder in the per-property hot loop.
+_TYPE_MAP = {
+    "string": str,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+
+@lru_cache(maxsize=8)
+def _read_schema_json(path: str, mtime: float) -> Dict[str, Any]:
+    """
+    Parse a schema JSON file, cached across SchemaManager instances.
+
+    Args:
+        path (str): Absolute path of the schema file
+        mtime (float): File modification time; keys the cache so an
+            edited file is re-parsed
+
+    Returns:
+        Dict[str, Any]: Parsed schema definitions
+    """
+    # orjson parses the schema files a few times faster than the
+    # stdlib; fall back to json when it is not installed.
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r") as f:
+        return json.load(f)
+
+class SchemaManager:
+    """
+    Schema manager for the knowledge graph.
+
+    This class loads the entity and relationship type definitions and
+    provides validation of entities and relationships against the schema,
+    as well as creation of the corresponding constraints and indexes.
+    """
+
+    def __init__(self, db_connection: Neo4jConnection, schema_dir: Optional[str] = None):
+        """
+        Initialize the schema manager.
+
+        Args:
+            db_connection (Neo4jConnection): Database connection instance
+            schema_dir (Optional[str]): Directory containing the schema files
+                (default: the repository 'schemas' directory)
+        """
+        self.db_connection = db_connection
+        self.schema_dir = schema_dir or SCHEMA_DIR
+        self.entity_types = self._load_schema_file("entity_types.json")
+        self.relationship_types = self._load_schema_file("relationship_types.json")
+        # Structural validation outcomes keyed by (type, property-key
+        # signature): ingestion repeats the same edge shapes, and for a
+        # fixed signature the missing/unknown-key errors and the spec
+        # map are deterministic — only property values change per call.
+        # Bounded: callers control the key-name part of the signature.
+        self._rel_sig_cache: LRUCache = LRUCache(maxsize=REL_SIG_CACHE_SIZE)
+        # Hints naming a missing index are server errors, so lookups
+        # only use the composite indexes once their creation has
+        # actually succeeded.
+        self._lookup_indexes_ready = False
+        # Inheritance is resolved once here; every later property
+        # lookup is a flat dict access instead of an inherits-chain
+        # walk per call.
+        self._flat_entity_props: Dict[str, Dict[str, Any]] = self._flatten_entity_properties()
+        # One compiled validator closure per entity type, built once at
+        # load; per-call validation is then a flat function call with
+        # the inheritance chain and required-key set already resolved.
+        self._entity_validators: Dict[str, Any] = {}
+        self._compile_entity_validators()
+        # Full validation results memoized by (type, sorted property
+        # items): ingestion re-validates identical dicts (repeated
+        # symbols like "x", "dx") and the second occurrence is a hash
+        # lookup. Unhashable property values fall back to the
+        # uncached path.
+        self._validate_entity_cached = lru_cache(maxsize=4096)(self._validate_entity_by_key)
+
+    def _load_schema_file(self, filename: str) -> Dict[str, Any]:
+        """
+        Load a schema definition file.
+
+        Args:
+            filename (str): Name of the schema file
+
+        Returns:
+            Dict[str, Any]: Parsed schema definitions
+        """
+        path = os.path.join(self.schema_dir, filename)
+        try:
+            return _read_schema_json(path, os.path.getmtime(path))
+        except Exception as e:
+            logger.error(f"Failed to load schema file '{path}': {str(e)}")
+            raise
+
+    def _flatten_entity_properties(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve the inherits chain of every entity type into a flat
+        property map.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Merged property definitions per
+            entity type, nearest definition winning
+        """
+        flat: Dict[str, Dict[str, Any]] = {}
+        for entity_type in self.entity_types:
+            allowed: Dict[str, Any] = {}
+            current = entity_type
+            seen = set()
+            # The seen guard turns a cyclic inherits chain into a
+            # truncated merge instead of an infinite loop.
+            while current is not None and current not in seen:
+                seen.add(current)
+                definition = self.entity_types.get(current)
+                if definition is None:
+                    break
+                for key, spec in definition.get("properties", {}).items():
+                    if key not in allowed:
+                        allowed[key] = spec
+                current = definition.get("inherits")
+            flat[entity_type] = allowed
+        return flat
+
+    def _compile_entity_validators(self) -> None:
+        """
+        Compile a validator closure for every entity type.
+
+        The inheritance walk, required-key scan, and property spec
+        merge run once per type here instead of once per validated
+        entity; each closure carries its resolved tables as defaults.
+        """
+        for entity_type in self.entity_types:
+            allowed = self.get_allowed_properties(entity_type)
+            required = tuple(
+                key for key, spec in allowed.items()
+                if spec.get("required") and key != "id"
+            )
+
+            def validator(properties: Dict[str, Any],
+                          _type: str = entity_type,
+                          _allowed: Dict[str, Any] = allowed,
+                          _required: tuple = required) -> Dict[str, Any]:
+                errors = []
+                for key in _required:
+                    if key not in properties:
+                        errors.append(f"Missing required property '{key}'")
+                for key, value in properties.items():
+                    spec = _allowed.get(key)
+                    if spec is None:
+                        errors.append(
+                            f"Unknown property '{key}' for entity type '{_type}'"
+                        )
+                        continue
+                    if not self._validate_property_type(value, spec.get("type", "")):
+                        errors.append(f"Property '{key}' has invalid type")
+                    if "enum" in spec and value not in spec["enum"]:
+                        errors.append(f"Property '{key}' must be one of {spec['enum']}")
+                return {"valid": not errors, "errors": errors}
+
+            self._entity_validators[entity_type] = validator
+
+    def _existing_schema_names(self) -> set:
+        """
+        Get the names of constraints and indexes already in the database.
+
+        Returns:
+            set: Existing schema object names; empty when the server
+            cannot be asked (the IF NOT EXISTS guards still apply)
+        """
+        try:
+            existing = {
+                record["name"]
+                for record in self.db_connection.execute_query("SHOW CONSTRAINTS YIELD name")
+            }
+            existing.update(
+                record["name"]
+                for record in self.db_connection.execute_query("SHOW INDEXES YIELD name")
+            )
+            return existing
+        except Exception as e:
+            logger.warning(f"Could not list existing schema objects: {str(e)}")
+            return set()
+
+    def initialize_db(self) -> None:
+        """
+        Initialize the database schema.
+
+        Creates the uniqueness constraint on entity identifiers and
+        indexes for common lookup properties. Objects are named so a
+        warm start can skip the ones that already exist instead of
+        re-submitting every statement for the server to parse.
+        """
+        # Anchor lookups also match the subtype labels directly, and a
+        # uniqueness constraint's cardinality-1 estimate is what lets
+        # the planner pick pinned-endpoint strategies for path queries.
+        statements = [
+            (
+                f"{label.lower()}_id_unique",
+                f"CREATE CONSTRAINT {label.lower()}_id_unique IF NOT EXISTS "
+                f"FOR (n:{label}) REQUIRE n.id IS UNIQUE",
+            )
+            for label in ("Entity", "Concept", "Symbol")
+        ]
+        statements.extend(
+            (
+                f"{entity_type.lower()}_name_idx",
+                f"CREATE INDEX {entity_type.lower()}_name_idx IF NOT EXISTS "
+                f"FOR (n:{entity_type}) ON (n.name)",
+            )
+            for entity_type in self.entity_types
+        )
+        # find_cross_domain_mappings filters on Concept.domain
+        statements.append(
+            (
+                "concept_domain_idx",
+                "CREATE INDEX concept_domain_idx IF NOT EXISTS FOR (n:Concept) ON (n.domain)",
+            )
+        )
+        existing = self._existing_schema_names()
+        missing = [ddl for name, ddl in statements if name not in existing]
+        if missing:
+            # One session carries the whole DDL batch instead of paying
+            # a session acquisition and round-trip per statement.
+            self.db_connection.run_statements(missing)
+        logger.info(
+            f"Database schema initialized ({len(missing)} of {len(statements)} statements submitted)"
+        )
+
+    def create_lookup_indexes(self) -> None:
+        """
+        Create the composite lookup indexes for hot query shapes.
+        """
+        statements = []
+        for entity_type, key_sets in COMPOSITE_LOOKUP_INDEXES.items():
+            for keys in key_sets:
+                name = f"{entity_type.lower()}_{'_'.join(keys)}_idx"
+                props = ", ".join(f"n.{prop}" for prop in keys)
+                statements.append(
+                    (
+                        name,
+                        f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{entity_type}) ON ({props})",
+                    )
+                )
+        existing = self._existing_schema_names()
+        missing = [ddl for name, ddl in statements if name not in existing]
+        if missing:
+            self.db_connection.run_statements(missing)
+        self._lookup_indexes_ready = True
+
+    def get_lookup_index(self, entity_type: str, keys) -> Optional[tuple]:
+        """
+        Get the composite index covering a property lookup, if any.
+
+        Args:
+            entity_type (str): Entity type name
+            keys: Property keys used by the lookup
+
+        Returns:
+            Optional[tuple]: Property keys of a composite index whose
+            keys are all constrained by the lookup, or None
+        """
+        if not self._lookup_indexes_ready:
+            return None
+        key_set = set(keys)
+        for index_keys in COMPOSITE_LOOKUP_INDEXES.get(entity_type, ()):
+            if key_set.issuperset(index_keys):
+                return index_keys
+        return None
+
+    def get_entity_types(self) -> List[str]:
+        """Get the list of defined entity type names."""
+        return list(self.entity_types.keys())
+
+    def get_relationship_types(self) -> List[str]:
+        """Get the list of defined relationship type names."""
+        return list(self.relationship_types.keys())
+
+    def is_valid_entity_type(self, entity_type: str) -> bool:
+        """
+        Check whether an entity type is defined in the schema.
+
+        Args:
+            entity_type (str): Entity type name
+
+        Returns:
+            bool: True if the entity type is defined
+        """
+        return entity_type in self.entity_types
+
+    def is_valid_relationship_type(self, relationship_type: str) -> bool:
+        """
+        Check whether a relationship type is defined in the schema.
+
+        Args:
+            relationship_type (str): Relationship type name
+
+        Returns:
+            bool: True if the relationship type is defined
+        """
+        return relationship_type in self.relationship_types
+
+    def validate_relationship_endpoints(self, relationship_type: str,
+                                        source_labels, target_labels) -> Dict[str, Any]:
+        """
+        Validate the endpoint entity types of a relationship.
+
+        Args:
+            relationship_type (str): Relationship type name
+            source_labels: Labels of the source entity
+            target_labels: Labels of the target entity
+
+        Returns:
+            Dict[str, Any]: Validation result with 'valid' flag and 'errors' list
+        """
+        errors = []
+
+        definition = self.relationship_types.get(relationship_type)
+        if definition is None:
+            return {"valid": False,
+                    "errors": [f"Unknown relationship type '{relationship_type}'"]}
+
+        source_types = definition.get("source_types")
+        if source_types and not any(label in source_types for label in source_labels):
+            errors.append(
+                f"Relationship '{relationship_type}' requires a source of type "
+                f"{source_types}, got {sorted(source_labels)}"
+            )
+
+        target_types = definition.get("target_types")
+        if target_types and not any(label in target_types for label in target_labels):
+            errors.append(
+                f"Relationship '{relationship_type}' requires a target of type "
+                f"{target_types}, got {sorted(target_labels)}"
+            )
+
+        return {"valid": not errors, "errors": errors}
+
+    def get_allowed_properties(self, entity_type: str) -> Dict[str, Any]:
+        """
+        Get the property definitions for an entity type, including
+        properties inherited from parent types.
+
+        Args:
+            entity_type (str): Entity type name
+
+        Returns:
+            Dict[str, Any]: Property name to property definition mapping
+        """
+        return self._flat_entity_props.get(entity_type, {})
+
+    def _validate_property_type(self, value: Any, expected_type: str) -> bool:
+        """
+        Check whether a property value matches the expected schema type.
+
+        Args:
+            value (Any): Property value
+            expected_type (str): Schema type name
+
+        Returns:
+            bool: True if the value matches the expected type
+        """
+        expected = _TYPE_MAP.get(expected_type)
+        if expected is None:
+            return True
+        # bool is an int subclass; keep it out of 'number'
+        if expected_type == "number" and isinstance(value, bool):
+            return False
+        return isinstance(value, expected)
+
+    def validate_entity(self, entity_type: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate entity properties against the schema.
+
+        Args:
+            entity_type (str): Entity type name
+            properties (Dict[str, Any]): Entity properties
+
+        Returns:
+            Dict[str, Any]: Validation result with 'valid' flag and 'errors' list
+        """
+        validator = self._entity_validators.get(entity_type)
+        if validator is None:
+            return {"valid": False, "errors": [f"Unknown entity type '{entity_type}'"]}
+        try:
+            return self._validate_entity_cached(
+                entity_type, tuple(sorted(properties.items()))
+            )
+        except TypeError:
+            # Unhashable property values (lists, nested maps)
+            return validator(properties)
+
+    def _validate_entity_by_key(self, entity_type: str, props_key: tuple) -> Dict[str, Any]:
+        """
+        Validate an entity from its hashable property-items key.
+
+        Args:
+            entity_type (str): Entity type name
+            props_key (tuple): Sorted (key, value) property items
+
+        Returns:
+            Dict[str, Any]: Validation result with 'valid' flag and 'errors' list
+        """
+        return self._entity_validators[entity_type](dict(props_key))
+
+    def validate_relationship(self, relationship_type: str,
+                              properties: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate relationship properties against the schema.
+
+        Args:
+            relationship_type (str): Relationship type name
+            properties (Dict[str, Any]): Relationship properties
+
+        Returns:
+            Dict[str, Any]: Validation result with 'valid' flag and 'errors' list
+        """
+        signature = (relationship_type, frozenset(properties))
+        cached = self._rel_sig_cache.get(signature)
+        if cached is None:
+            structural_errors = []
+
+            if not self.is_valid_relationship_type(relationship_type):
+                return {"valid": False,
+                        "errors": [f"Unknown relationship type '{relationship_type}'"]}
+
+            allowed = self.relationship_types[relationship_type].get("properties", {})
+
+            for key, spec in allowed.items():
+                if spec.get("required") and key not in properties:
+                    structural_errors.append(f"Missing required property '{key}'")
+
+            for key in properties:
+                if key not in allowed:
+                    structural_errors.append(
+                        f"Unknown property '{key}' for relationship type '{relationship_type}'"
+                    )
+
+            cached = (tuple(structural_errors), allowed)
+            self._rel_sig_cache[signature] = cached
+
+        structural_errors, allowed = cached
+        errors = list(structural_errors)
+
+        # Only the value checks depend on this call's data
+        for key, value in properties.items():
+            spec = allowed.get(key)
+            if spec is not None and not self._validate_property_type(value, spec.get("type", "")):
+                errors.append(f"Property '{key}' has invalid type")
+
+        return {"valid": not errors, "errors": errors}
+
+    def clear_validation_cache(self) -> None:
+        """Clear the memoized validation results after a schema change."""
+        self._rel_sig_cache.clear()
+        self._validate_entity_cached.cache_clear()
@@ -5,22 +5,28 @@ This module initializes and runs the Knowledge Storage MCP server.
 """
 
 import argparse
+import asyncio
 import logging
 import os
+import sys
+import threading
 from typing import Optional
 
-import dotenv
 from modelcontextprotocol import MCPServer
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from knowledge_storage_mcp.api.entities import register_entity_endpoints
 from knowledge_storage_mcp.api.relationships import register_relationship_endpoints
 from knowledge_storage_mcp.api.queries import register_query_endpoints
+from knowledge_storage_mcp.config import get_settings
 from knowledge_storage_mcp.db.connection import Neo4jConnection
+from knowledge_storage_mcp.db.schema import SchemaManager
 from knowledge_storage_mcp.utils.logging import setup_logging
 
-# Load environment variables
-dotenv.load_dotenv()
-
 # Set up logging
 logger = setup_logging("knowledge_storage_mcp.server")
 
@@ -44,12 +50,14 @@ def create_server(
     Returns:
         MCPServer: Configured MCP server instance
     """
-    # Get configuration from environment variables or parameters
-    host = host or os.getenv("MCP_HOST", "0.0.0.0")
-    port = port or int(os.getenv("MCP_PORT", "8000"))
-    neo4j_uri = neo4j_uri or os.getenv("NEO4J_URI", "bolt://localhost:7687")
-    neo4j_username = neo4j_username or os.getenv("NEO4J_USERNAME", "neo4j")
-    neo4j_password = neo4j_password or os.getenv("NEO4J_PASSWORD")
+    # Fill unset parameters from the cached process settings (env and
+    # .env are read once, not per create_server call)
+    settings = get_settings()
+    host = host or settings.host
+    port = port or settings.port
+    neo4j_uri = neo4j_uri or settings.neo4j_uri
+    neo4j_username = neo4j_username or settings.neo4j_username
+    neo4j_password = neo4j_password or settings.neo4j_password
     
     if not neo4j_password:
         raise ValueError("Neo4j password must be provided")
@@ -61,6 +69,22 @@ def create_server(
         password=neo4j_password,
     )
     
+    # Initialize the database schema (uniqueness constraints and
+    # indexes) in the background: the driver connects lazily, so doing
+    # the Bolt handshake and DDL off the startup path keeps create_server
+    # sub-second and avoids MCP client timeouts on cold starts. The
+    # statements are idempotent, and a query racing ahead of an index
+    # merely runs unindexed once.
+    threading.Thread(
+        target=SchemaManager(db_connection).initialize_db,
+        name="schema-init",
+        daemon=True,
+    ).start()
+
+    # Background connectivity probe; health checks read the cached
+    # flag instead of paying a Bolt round-trip per call.
+    db_connection.start_health_monitor()
+
     # Create MCP server
     server = MCPServer(
         name="Knowledge Storage MCP",
@@ -76,14 +100,71 @@ def create_server(
     register_entity_endpoints(server, db_connection)
     register_relationship_endpoints(server, db_connection)
     register_query_endpoints(server, db_connection)
+
+    @server.register_function(
+        name="health_check",
+        description="Check server and database health",
+        parameters=[],
+    )
+    async def health_check() -> dict:
+        """
+        Check whether the server and its database are healthy.
+        
+        Returns the connectivity flag maintained by the background
+        probe, so health-poll storms cost no Bolt round-trips.
+        
+        Returns:
+            Dict with success status and database connectivity
+        """
+        return {
+            "success": True,
+            "database_connected": db_connection.healthy,
+        }
     
     logger.info(f"Server configured at {host}:{port}")
     logger.info(f"Connected to Neo4j at {neo4j_uri}")
     
     return server
 
+def get_registered_function(server: MCPServer, name: str):
+    """
+    Look up a registered MCP function by name.
+    
+    Public accessor so callers (scripts, tests) don't reach into the
+    SDK's private registry attribute, which is free to change shape.
+    
+    Args:
+        server: The MCP server instance
+        name: Registered function name
+    
+    Returns:
+        The registered callable, or None if no such function
+    """
+    registry = getattr(server, "functions", None)
+    if registry is None:
+        registry = getattr(server, "_functions", {})
+    return registry.get(name)
+
 def main():
     """Run the Knowledge Storage MCP server."""
+    # Experimental io_uring-backed loop (Linux >= 5.6): batches socket
+    # submissions/completions through one ring, cutting syscalls under
+    # high fan-in. Opt-in because the backing package is not a
+    # standard dependency.
+    if os.getenv("KS_IO_URING") == "1" and sys.platform.startswith("linux"):
+        try:
+            import asyncio_uring
+            asyncio.set_event_loop_policy(asyncio_uring.EventLoopPolicy())
+            logger.info("Using io_uring event loop")
+        except ImportError:
+            logger.warning("KS_IO_URING=1 set but asyncio_uring is not installed")
+    # uvloop replaces the default event loop with a faster one; the
+    # async Bolt driver benefits directly. Optional and Linux/macOS
+    # only.
+    elif uvloop is not None and sys.platform != "win32":
+        uvloop.install()
+        logger.info("Using uvloop event loop")
+
     parser = argparse.ArgumentParser(description="Knowledge Storage MCP Server")
     parser.add_argument("--host", help="Server host")
     parser.add_argument("--port", type=int, help="Server port")
@@ -5,9 +5,14 @@ This module provides a consistent logging setup across the MCP server,
 with configurable log levels and formatting.
 """
 
+import atexit
+import functools
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
 from typing import Optional
 
 from pythonjsonlogger import jsonlogger
@@ -31,10 +36,65 @@ NUMERIC_LOG_LEVEL = LOG_LEVEL_MAP.get(LOG_LEVEL, logging.INFO)
 # Configure log format for JSON logging
 JSON_LOG_FORMAT = "%(asctime)s %(name)s %(levelname)s %(message)s"
 
+# File logging can be disabled wholesale (LOG_TO_FILE=0) so deployments
+# that only read stdout don't pay a second format + write per record
+LOG_TO_FILE = os.getenv("LOG_TO_FILE", "1") != "0"
+
+# Formatters are stateless; one instance each serves every logger
+# instead of a fresh pair per setup_logging call
+_JSON_FORMATTER = jsonlogger.JsonFormatter(JSON_LOG_FORMAT)
+_STREAM_FORMATTER = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+# File records are enqueued by the emitting thread and written by a
+# single background listener, so request paths never block on disk
+_log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+_queue_listener: Optional[QueueListener] = None
+
+# Rotation bounds for the shared log file
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+
+def _get_queue_handler() -> Optional[QueueHandler]:
+    """
+    Get a handler that enqueues records for the background file writer.
+    
+    The listener and its rotating file handler are created on first
+    use; returns None when the log directory cannot be created.
+    
+    Returns:
+        QueueHandler feeding the shared listener, or None
+    """
+    global _queue_listener
+    if _queue_listener is None:
+        log_dir = Path.cwd() / "logs"
+        # One idempotent mkdir instead of exists + makedirs + exists.
+        try:
+            log_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            # Skip file logging if can't create directory
+            return None
+        file_handler = RotatingFileHandler(
+            log_dir / "knowledge_storage_mcp.log",
+            maxBytes=LOG_FILE_MAX_BYTES,
+            backupCount=LOG_FILE_BACKUP_COUNT,
+        )
+        file_handler.setFormatter(_JSON_FORMATTER)
+        _queue_listener = QueueListener(_log_queue, file_handler, respect_handler_level=True)
+        _queue_listener.start()
+        atexit.register(_queue_listener.stop)
+    return QueueHandler(_log_queue)
+
+@functools.lru_cache(maxsize=None)
 def setup_logging(module_name: str, level: Optional[str] = None) -> logging.Logger:
     """
     Configure and return a logger for the specified module.
     
+    Repeated calls with the same arguments (module re-imports, dev hot
+    reload) return the already-configured logger instead of tearing
+    down and rebuilding its handlers.
+    
     Args:
         module_name: Name of the module for the logger
         level: Log level (if None, use environment or default)
@@ -57,32 +117,18 @@ def setup_logging(module_name: str, level: Optional[str] = None) -> logging.Logg
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
     
-    # Create formatters
-    json_formatter = jsonlogger.JsonFormatter(JSON_LOG_FORMAT)
-    stream_formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    
     # Create console handler
     console_handler = logging.StreamHandler(stream=sys.stdout)
     console_handler.setLevel(numeric_level)
-    console_handler.setFormatter(stream_formatter)
-    
-    # Create file handler if log directory exists
-    log_dir = os.path.join(os.getcwd(), "logs")
-    if not os.path.exists(log_dir):
-        try:
-            os.makedirs(log_dir)
-        except Exception:
-            # Skip file logging if can't create directory
-            pass
+    console_handler.setFormatter(_STREAM_FORMATTER)
     
-    if os.path.exists(log_dir):
-        log_file = os.path.join(log_dir, f"{module_name.replace('.', '_')}.log")
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(numeric_level)
-        file_handler.setFormatter(json_formatter)
-        logger.addHandler(file_handler)
+    # File logging goes through the shared queue so emitting threads
+    # pay an enqueue instead of a write syscall per record
+    if LOG_TO_FILE:
+        queue_handler = _get_queue_handler()
+        if queue_handler is not None:
+            queue_handler.setLevel(numeric_level)
+            logger.addHandler(queue_handler)
     
     # Add console handler
     logger.addHandler(console_handler)